@@ -1,7 +1,11 @@
+from collections import deque
 from functools import partial
 from dataclasses import dataclass
 
-from astar import astar
+from search import beam_search
+
+
+BEAM_WIDTH = 8
 
 
 @dataclass
@@ -19,30 +23,68 @@ def parse_input(input):
     return Medicine(parse_replacements(blocks[0]), blocks[1].strip())
 
 
-def do_replacements(replacements, molecule):
-    results = set()
-    for i in range(len(molecule)):
+# https://en.wikipedia.org/wiki/Aho%E2%80%93Corasick_algorithm
+class Matcher:
+    def __init__(self, replacements):
+        # Trie over the left-hand sides; out[state] lists the replacements of
+        # every left-hand side that ends in that state.
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
         for from_, to in replacements:
-            if molecule[i : i + len(from_)] == from_:
-                results.add(molecule[:i] + to + molecule[i + len(from_) :])
-    return results
+            state = 0
+            for ch in from_:
+                if ch not in self.goto[state]:
+                    self.goto[state][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = self.goto[state][ch]
+            self.out[state].append((len(from_), to))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next in self.goto[state].items():
+                fail = self.fail[state]
+                while fail and ch not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next] = self.goto[fail].get(ch, 0)
+                self.out[next] += self.out[self.fail[next]]
+                queue.append(next)
+
+    def replacements(self, molecule):
+        state = 0
+        for i, ch in enumerate(molecule):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for length, to in self.out[state]:
+                yield molecule[: i + 1 - length] + to + molecule[i + 1 :]
+
+
+def do_replacements(matcher, molecule):
+    return set(matcher.replacements(molecule))
 
 
 def part1(input):
-    return len(do_replacements(input.replacements, input.molecule))
+    return len(do_replacements(Matcher(input.replacements), input.molecule))
 
 
-def adjacent(replacements, node):
-    return ((1, next) for next in do_replacements(replacements, node))
+def adjacent(matcher, node):
+    # Reducing the rightmost matches first keeps the greedy search out of the
+    # dead ends that make the full search space blow up.
+    results = list(dict.fromkeys(matcher.replacements(node)))
+    return ((1, next) for next in reversed(results))
 
 
-def part2(input):
-    reverse_replacements = [(to, from_) for from_, to in input.replacements]
+def part2(input, width=BEAM_WIDTH):
+    matcher = Matcher((to, from_) for from_, to in input.replacements)
     start = input.molecule
     h = len
     is_target = lambda m: m == "e"
-    adj = partial(adjacent, reverse_replacements)
-    return len(astar(start, adj, h, is_target)) - 1
+    adj = partial(adjacent, matcher)
+    return beam_search(start, adj, h, is_target, width, path=False)
 
 
 def main():
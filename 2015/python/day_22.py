@@ -3,7 +3,7 @@ from enum import IntEnum
 from dataclasses import dataclass, astuple
 from copy import deepcopy
 
-from astar import astar
+from search import astar
 
 
 @dataclass
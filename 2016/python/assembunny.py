@@ -0,0 +1,270 @@
+from itertools import islice
+
+
+REGISTERS = "abcd"
+
+CPY, INC, DEC, JNZ, TGL, OUT, NOP, ADD, MUL = range(9)
+
+
+def parse_input(input):
+    return [line.split() for line in input.strip().splitlines()]
+
+
+def toggle(instr):
+    if len(instr) == 2:
+        return ["dec" if instr[0] == "inc" else "inc", instr[1]]
+    else:
+        return ["cpy" if instr[0] == "jnz" else "jnz", instr[1], instr[2]]
+
+
+def is_reg(val):
+    return val in REGISTERS
+
+
+def match_add(prog, i):
+    # inc x / dec y / jnz y -2 (inc and dec in either order): x += y, y = 0
+    if i + 3 > len(prog):
+        return None
+    first, second, jnz = prog[i : i + 3]
+    if len(first) != 2 or len(second) != 2 or jnz[0] != "jnz" or jnz[2] != "-2":
+        return None
+    ops = {first[0]: first[1], second[0]: second[1]}
+    if set(ops) != {"inc", "dec"}:
+        return None
+    x, y = ops["inc"], ops["dec"]
+    if not is_reg(x) or not is_reg(y) or x == y or jnz[1] != y:
+        return None
+    return x, y
+
+
+def match_mul(prog, i):
+    # cpy s t / <add loop x += t> / dec u / jnz u -5: x += s * u, t = u = 0
+    if i + 6 > len(prog):
+        return None
+    cpy, dec, jnz = prog[i], prog[i + 4], prog[i + 5]
+    if cpy[0] != "cpy" or dec[0] != "dec" or jnz[0] != "jnz" or jnz[2] != "-5":
+        return None
+    s, t, u = cpy[1], cpy[2], dec[1]
+    add = match_add(prog, i + 1)
+    if add is None or add[1] != t or jnz[1] != u:
+        return None
+    x = add[0]
+    if not is_reg(u) or len({x, t, u}) != 3 or s in (x, t, u):
+        return None
+    return x, s, t, u
+
+
+def decode(prog):
+    # Decodes `prog` (lists of strings) into tuples of integers. Operands are
+    # indices into the register file: the four registers come first, followed
+    # by a slot for every constant. Instructions that became invalid through a
+    # toggle decode to NOP.
+    consts = {}
+
+    def slot(val):
+        if is_reg(val):
+            return REGISTERS.index(val)
+        n = int(val)
+        if n not in consts:
+            consts[n] = len(REGISTERS) + len(consts)
+        return consts[n]
+
+    code = []
+    for instr in prog:
+        match instr:
+            case ["cpy", x, y] if is_reg(y):
+                code.append((CPY, slot(x), slot(y)))
+            case ["inc", x] if is_reg(x):
+                code.append((INC, slot(x)))
+            case ["dec", x] if is_reg(x):
+                code.append((DEC, slot(x)))
+            case ["jnz", x, y]:
+                code.append((JNZ, slot(x), slot(y)))
+            case ["tgl", x]:
+                code.append((TGL, slot(x)))
+            case ["out", x]:
+                code.append((OUT, slot(x)))
+            case [("cpy" | "inc" | "dec"), *_]:
+                code.append((NOP,))
+            case _:
+                raise Exception(f"unknown instruction: {instr[0]}")
+
+    # Superinstructions replace the head of a fused loop; the instructions
+    # after it stay in place for jumps into the middle of the loop. When a loop
+    # counter isn't positive the head instruction runs on its own instead.
+    fused = list(code)
+    for i in range(len(prog)):
+        if m := match_mul(prog, i):
+            x, s, t, u = map(slot, m)
+            fused[i] = (MUL, x, s, t, u, i + 6, code[i])
+        elif m := match_add(prog, i):
+            x, y = map(slot, m)
+            fused[i] = (ADD, x, y, i + 3, code[i])
+
+    consts = [n for n, _ in sorted(consts.items(), key=lambda kv: kv[1])]
+    return fused, consts
+
+
+def execute(prog, regs):
+    # Runs `prog` until it halts, yielding every `out` value. `regs` is updated
+    # in place when the program halts or the generator is closed.
+    prog = [list(instr) for instr in prog]
+    code, consts = decode(prog)
+    r = [regs[reg] for reg in REGISTERS] + consts
+    ip = 0
+    try:
+        while 0 <= ip < len(code):
+            instr = code[ip]
+            op = instr[0]
+            if op == ADD:
+                if r[instr[2]] > 0:
+                    r[instr[1]] += r[instr[2]]
+                    r[instr[2]] = 0
+                    ip = instr[3]
+                    continue
+                instr = instr[4]
+                op = instr[0]
+            elif op == MUL:
+                if r[instr[2]] > 0 and r[instr[4]] > 0:
+                    r[instr[1]] += r[instr[2]] * r[instr[4]]
+                    r[instr[3]] = 0
+                    r[instr[4]] = 0
+                    ip = instr[5]
+                    continue
+                instr = instr[6]
+                op = instr[0]
+
+            ip += 1
+            if op == CPY:
+                r[instr[2]] = r[instr[1]]
+            elif op == INC:
+                r[instr[1]] += 1
+            elif op == DEC:
+                r[instr[1]] -= 1
+            elif op == JNZ:
+                if r[instr[1]] != 0:
+                    ip += r[instr[2]] - 1
+            elif op == OUT:
+                yield r[instr[1]]
+            elif op == TGL:
+                tgt = ip - 1 + r[instr[1]]
+                if 0 <= tgt < len(prog):
+                    prog[tgt] = toggle(prog[tgt])
+                    # Decode everything again: the toggled instruction can make
+                    # or break a fused loop around it.
+                    code, consts = decode(prog)
+                    r = r[: len(REGISTERS)] + consts
+    finally:
+        regs.update(zip(REGISTERS, r))
+
+
+def run(prog, regs):
+    for _ in execute(prog, regs):
+        pass
+
+
+def outputs(prog, regs, limit):
+    # Streams at most `limit` output values, then stops the program.
+    gen = execute(prog, regs)
+    try:
+        yield from islice(gen, limit)
+    finally:
+        gen.close()
+
+
+def _interpret(prog, regs):
+    # Plain interpreter without fused loops, to check the VM against.
+    prog = [list(instr) for instr in prog]
+    value = lambda x: regs[x] if is_reg(x) else int(x)
+    ip = 0
+    while 0 <= ip < len(prog):
+        match prog[ip]:
+            case ["cpy", x, y] if is_reg(y):
+                regs[y] = value(x)
+            case ["inc", x] if is_reg(x):
+                regs[x] += 1
+            case ["dec", x] if is_reg(x):
+                regs[x] -= 1
+            case ["jnz", x, y] if value(x) != 0:
+                ip += value(y)
+                continue
+            case ["tgl", x]:
+                tgt = ip + value(x)
+                if 0 <= tgt < len(prog):
+                    prog[tgt] = toggle(prog[tgt])
+        ip += 1
+    return regs
+
+
+def _check(input, **regs):
+    prog = parse_input(input)
+    start = {"a": 0, "b": 0, "c": 0, "d": 0}
+    expected = _interpret(prog, dict(start))
+    result = dict(start)
+    run(prog, result)
+    assert result == expected
+    for reg, value in regs.items():
+        assert result[reg] == value
+
+
+def test_add():
+    _check("cpy 5 a\ncpy 3 b\ninc a\ndec b\njnz b -2", a=8, b=0)
+    _check("cpy 5 a\ncpy 3 b\ndec b\ninc a\njnz b -2", a=8, b=0)
+
+
+def test_mul():
+    _check(
+        "cpy 4 b\ncpy 3 d\ncpy b c\ninc a\ndec c\njnz c -2\ndec d\njnz d -5",
+        a=12,
+        c=0,
+        d=0,
+    )
+
+
+def test_jump_into_fused_loop():
+    # Starts at `dec b` in the middle of the loop: one step is taken before the
+    # fused head runs with b = 2.
+    _check("cpy 3 b\njnz 1 2\ninc a\ndec b\njnz b -2", a=2, b=0)
+
+
+def test_toggle_breaks_fused_loop():
+    # The tgl turns the inner `jnz c -2` of the MUL block into `cpy c -2`, an
+    # invalid instruction, so neither MUL nor ADD may fire any more.
+    _check(
+        "cpy 4 b\ncpy 3 d\ntgl 4\ncpy b c\ninc a\ndec c\njnz c -2\ndec d\njnz d -5",
+        a=3,
+        c=3,
+        d=0,
+    )
+    # Toggling `jnz d -5` into `cpy d -5` ends the outer loop after one pass
+    # but leaves the inner ADD loop intact. A stale MUL would give a = 8.
+    _check(
+        "cpy 4 b\ncpy 2 d\ntgl 6\ncpy b c\ninc a\ndec c\njnz c -2\ndec d\njnz d -5",
+        a=4,
+        c=0,
+        d=1,
+    )
+
+
+def test_counter_not_positive():
+    # Entered with its counter at 0, the loop never ends in the plain code:
+    # the fused code must run the head on its own instead of doing a += b. The
+    # VM is stopped by a timer; by then the loop ran for a while unfused.
+    import signal
+
+    import pytest
+
+    def timeout(signum, frame):
+        raise TimeoutError
+
+    regs = {"a": 0, "b": 0, "c": 0, "d": 0}
+    previous = signal.signal(signal.SIGALRM, timeout)
+    signal.setitimer(signal.ITIMER_REAL, 0.1)
+    try:
+        with pytest.raises(TimeoutError):
+            run(parse_input("inc a\ndec b\njnz b -2"), regs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+    assert regs["a"] > 1000
+    assert regs["a"] + regs["b"] in (0, 1)
@@ -1,8 +1,8 @@
 import re
-from itertools import chain, combinations
-from copy import deepcopy
+from functools import partial
+from itertools import combinations
 
-from astar import astar
+from search import astar
 
 
 DEBUG = False
@@ -29,30 +29,54 @@ def parse_input(input):
     )
 
 
-def items_safe_on_floor(items):
-    # microchip can't be on a floor (without it's rtg) with other rtg's
-    queue = set(items)
-    count = 0
-    for item in items:
-        if item[0] == "generator":
-            count += 1
-            queue.remove(item)
-            microchip = ("microchip", item[1])
-            if microchip in queue:
-                queue.remove(microchip)
-    return count == 0 or len(queue) == 0
+def to_pairs(state):
+    # Floor of the generator and the microchip of every element.
+    floors = {item: floor for floor, items in enumerate(state) for item in items}
+    names = sorted(set(name for _, name in floors))
+    return [(floors[("generator", n)], floors[("microchip", n)]) for n in names]
 
 
-def unfreeze_state(state):
-    return [set(items) for items in state]
+def encode(elevator, pairs):
+    # Pack the elevator and the (generator, microchip) floors of every element
+    # into an int, two bits per floor. Elements are interchangeable, so the
+    # pairs are sorted: states that only differ in names encode the same.
+    state = 0
+    for g, m in sorted(pairs, reverse=True):
+        state = (state << 4) | (g << 2) | m
+    return (state << 2) | elevator
 
 
-def freeze_state(state):
-    return tuple(map(frozenset, state))
+def decode(n, state):
+    elevator = state & 3
+    pairs = []
+    for _ in range(n):
+        state >>= 2
+        m = state & 3
+        state >>= 2
+        pairs.append((state & 3, m))
+    return elevator, pairs
 
 
-def adjacent(node):
-    floor, state = node
+def bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
+
+
+def is_safe(generators, microchips):
+    # Bitmasks of the elements on a floor: a microchip can't be on a floor
+    # (without it's rtg) with other rtg's.
+    return not generators or not microchips & ~generators
+
+
+def adjacent(n, state):
+    floor, pairs = decode(n, state)
+    generators = [0] * 4
+    microchips = [0] * 4
+    for k, (g, m) in enumerate(pairs):
+        generators[g] |= 1 << k
+        microchips[m] |= 1 << k
 
     next_floors = []
     if floor < 3:
@@ -60,53 +84,61 @@ def adjacent(node):
     if floor > 0:
         next_floors.append(floor - 1)
 
-    # Take one or two items.
-    choices = [set([item]) for item in state[floor]] + list(
-        map(set, combinations(state[floor], 2))
-    )
+    # Take one or two items, as (generators, microchips) masks.
+    items = [(b, 0) for b in bits(generators[floor])]
+    items += [(0, b) for b in bits(microchips[floor])]
+    choices = items + [(a[0] | b[0], a[1] | b[1]) for a, b in combinations(items, 2)]
+
     for next_floor in next_floors:
-        for choice in choices:
-            if items_safe_on_floor(state[next_floor] | choice) and items_safe_on_floor(
-                state[floor] - choice
-            ):
-                next_state = unfreeze_state(state)
-                for item in choice:
-                    next_state[floor].remove(item)
-                    next_state[next_floor].add(item)
-                yield 1, (next_floor, freeze_state(next_state))
-
-
-def print_path(path, all_items):
+        for g, m in choices:
+            if is_safe(
+                generators[next_floor] | g, microchips[next_floor] | m
+            ) and is_safe(generators[floor] & ~g, microchips[floor] & ~m):
+                next_pairs = [
+                    (
+                        next_floor if g >> k & 1 else gf,
+                        next_floor if m >> k & 1 else mf,
+                    )
+                    for k, (gf, mf) in enumerate(pairs)
+                ]
+                yield 1, encode(next_floor, next_pairs)
+
+
+def print_path(n, path):
     print()
-    for floor, state in path:
+    for state in path:
+        floor, pairs = decode(n, state)
         for i in range(4, 0, -1):
             line = f"F{i} {'E' if floor == i - 1 else '.'} "
-            for item in sorted(all_items):
-                if item in state[i - 1]:
-                    line += f"{item[0][0]}{item[1][0:2]} "
-                else:
-                    line += ".   "
+            for k, (g, m) in enumerate(pairs):
+                line += f"G{k} " if g == i - 1 else ".  "
+                line += f"M{k} " if m == i - 1 else ".  "
             print(line)
         print()
 
 
 def part1(input):
+    pairs = to_pairs(input)
+    n = len(pairs)
     # Elevator starts on the first floor.
-    start = (0, input)
+    start = encode(0, pairs)
     # Target: everything in assembling machine on fourth floor.
-    all_items = set(chain(*input))
-    is_target = lambda node: node[0] == 3 and node[1][3] == all_items
-    h = lambda node: (3 - node[0]) + len(node[1][3]) - len(all_items)
-    path = astar(start, adjacent, h, is_target)
+    target = encode(3, [(3, 3)] * n)
+    is_target = lambda state: state == target
+    # Every step moves at most two items one floor.
+    h = lambda state: (sum(6 - g - m for g, m in decode(n, state)[1]) + 1) // 2
+    adj = partial(adjacent, n)
 
     if DEBUG:
-        print_path(path, all_items)
+        path = astar(start, adj, h, is_target)
+        print_path(n, path)
+        return len(path) - 1
 
-    return len(path) - 1
+    return astar(start, adj, h, is_target, path=False)
 
 
 def part2(input):
-    state = unfreeze_state(input)
+    state = [set(items) for items in input]
     state[0].update(
         {
             ("generator", "elerium"),
@@ -115,7 +147,7 @@ def part2(input):
             ("microchip", "dilithium"),
         },
     )
-    return part1(freeze_state(state))
+    return part1(tuple(map(frozenset, state)))
 
 
 def main():
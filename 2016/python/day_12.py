@@ -1,31 +1,4 @@
-def parse_input(input):
-    return [line.split() for line in input.strip().splitlines()]
-
-
-def reg_or_const(val, regs):
-    try:
-        return int(val)
-    except:
-        return regs[val]
-
-
-def run(prog, regs):
-    ip = 0
-    while True:
-        try:
-            instr = prog[ip]
-        except:
-            break
-        ip += 1
-        if instr[0] == "cpy":
-            regs[instr[2]] = reg_or_const(instr[1], regs)
-        elif instr[0] == "inc":
-            regs[instr[1]] += 1
-        elif instr[0] == "dec":
-            regs[instr[1]] -= 1
-        elif instr[0] == "jnz":
-            if reg_or_const(instr[1], regs) != 0:
-                ip += int(instr[2]) - 1
+from assembunny import parse_input, run
 
 
 def part1(prog):
@@ -1,7 +1,7 @@
 from functools import partial
 from itertools import chain
 
-from astar import astar
+from search import bidirectional
 
 
 def parse_input(input):
@@ -32,16 +32,12 @@ def adjacent(input, pos):
             yield (1, n)
 
 
-def manhattan(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-
 def shortest_path(input, target):
+    # Corridors go both ways, so the search from the target uses the same
+    # adjacency.
     start = (1, 1)
-    h = partial(manhattan, target)
-    is_target = lambda n: n == target
     adj = partial(adjacent, input)
-    return len(astar(start, adj, h, is_target)) - 1
+    return bidirectional(start, target, adj, adj, path=False)
 
 
 def part1(input):
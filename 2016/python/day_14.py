@@ -1,41 +1,23 @@
-import hashlib
-from functools import partial
+import re
 from itertools import count, islice
 from collections import defaultdict
 
+import md5
+
 
 def parse_input(input):
     return input.strip()
 
 
-def find_seqs(hash, size):
-    for i in range(len(hash) - (size - 1)):
-        found = True
-        for j in range(1, size):
-            if hash[i] != hash[i + j]:
-                found = False
-                break
-        if found:
-            yield hash[i]
-
-
-def hash(salt, idx):
-    return hashlib.md5(bytes(f"{salt}{idx}", "utf-8")).hexdigest()
-
-
-def stretched_hash(count, salt, idx):
-    h = hash(salt, idx)
-    for _ in range(count):
-        h = hashlib.md5(bytes(h, "utf-8")).hexdigest()
-    return h
-
+# First triplet and all quintlets of a character in a hex digest.
+TRIPLET = re.compile(r"(.)\1\1")
+QUINTLET = re.compile(r"(.)\1{4}")
 
-def keys(salt, hash_fn):
-    def make_hash(salt, idx):
-        h = hash_fn(salt, idx)
-        return (h, set(find_seqs(h, 5)))
 
-    window = [make_hash(salt, idx) for idx in range(1000)]
+def keys(hashes):
+    # `hashes` yields (idx, hexdigest) for consecutive indices.
+    hashes = ((h, set(QUINTLET.findall(h))) for _, h in hashes)
+    window = list(islice(hashes, 1000))
 
     # Keep a dict of quintlets found in the window. We remember the idx so we
     # can remove them when the hash is shifted from the window.
@@ -51,22 +33,22 @@ def keys(salt, hash_fn):
             if not quintlets[ch]:
                 del quintlets[ch]
 
-        window[idx % 1000] = make_hash(salt, idx + 1000)
+        window[idx % 1000] = next(hashes)
         for ch in window[idx % 1000][1]:
             quintlets[ch].add(idx + 1000)
 
-        for ch in islice(find_seqs(h, 3), 0, 1):
-            if ch in quintlets:
-                yield idx
+        m = TRIPLET.search(h)
+        if m and m.group(1) in quintlets:
+            yield idx
 
 
 def part1(input):
-    return list(islice(keys(input, hash), 0, 64))[-1]
+    # Unstretched hashes are too cheap to pay for starting a process pool.
+    return list(islice(keys(md5.hashes(input, processes=1)), 0, 64))[-1]
 
 
 def part2(input):
-    hash = partial(stretched_hash, 2016)
-    return list(islice(keys(input, hash), 0, 64))[-1]
+    return list(islice(keys(md5.hashes(input, stretch=2016)), 0, 64))[-1]
 
 
 def main():
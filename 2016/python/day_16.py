@@ -24,12 +24,52 @@ def fill_disk(initial, length):
     return fill_disk(initial + "0" + "".join(map(flip, reversed(initial))), length)
 
 
+# The filled disk is the seed a and its reversed complement b alternating
+# (a, b, a, b, ...), with the dragon curve joiners in between: joiner i
+# (1-based) is 1 iff the odd part of i is 3 mod 4. Each checksum digit covers
+# a chunk of 2^k bits and is 1 iff that chunk holds an even number of ones, so
+# it follows from the parity of the ones up to both ends of the chunk.
+def dragon_checksum(initial, length):
+    a = [int(c) for c in initial]
+    b = [1 - c for c in reversed(a)]
+    prefix_a = [0]
+    prefix_b = [0]
+    for x, y in zip(a, b):
+        prefix_a.append(prefix_a[-1] ^ x)
+        prefix_b.append(prefix_b[-1] ^ y)
+
+    def joiners_parity(q):
+        # Ones among the first q joiners: for every i = 2^t * o, count the
+        # o <= q >> t with o % 4 == 3.
+        ones = 0
+        while q:
+            ones += (q + 1) // 4
+            q >>= 1
+        return ones & 1
+
+    def parity(n):
+        # Parity of the ones in the first n bits of the disk.
+        q, r = divmod(n, len(a) + 1)
+        p = joiners_parity(q)
+        p ^= prefix_a[-1] & ((q + 1) // 2)
+        p ^= prefix_b[-1] & (q // 2)
+        p ^= prefix_a[r] if q % 2 == 0 else prefix_b[r]
+        return p
+
+    chunk = length & -length
+    if chunk == 1:
+        return fill_disk(initial, length)
+    return "".join(
+        str(1 ^ parity(i) ^ parity(i + chunk)) for i in range(0, length, chunk)
+    )
+
+
 def part1(input):
-    return checksum(fill_disk(input, 272))
+    return dragon_checksum(input, 272)
 
 
 def part2(input):
-    return checksum(fill_disk(input, 35651584))
+    return dragon_checksum(input, 35651584)
 
 
 def main():
@@ -50,3 +90,11 @@ def test_checksum():
 
 def test_part1():
     assert checksum(fill_disk("10000", 20)) == "01100"
+
+
+def test_dragon_checksum():
+    assert dragon_checksum("10000", 20) == "01100"
+    for initial in ["1", "10000", "01111010110010011"]:
+        for length in range(1, 300):
+            expected = checksum(fill_disk(initial, length))
+            assert dragon_checksum(initial, length) == expected
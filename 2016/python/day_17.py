@@ -1,7 +1,7 @@
 import hashlib
 from functools import partial
 
-from astar import astar
+from search import astar
 
 
 START = ((0, 0), ())
@@ -22,16 +22,20 @@ def neighbors(pos):
     return [("U", (x, y - 1)), ("D", (x, y + 1)), ("L", (x - 1, y)), ("R", (x + 1, y))]
 
 
-def is_door_open(ch):
-    return ch in "bcdef"
+def open_doors(digest):
+    # Doors are open when their hex digit is b, c, d, e or f.
+    a, b = digest[0], digest[1]
+    return (a >> 4 > 10, a & 0xF > 10, b >> 4 > 10, b & 0xF > 10)
 
 
-def adjacent(passcode, node):
+def adjacent(seed, node):
+    # `seed` is an md5 object that has already hashed the passcode.
     pos, path = node
-    hash = hashlib.md5(bytes(f"{passcode}{''.join(path)}", "utf-8")).hexdigest()
-    for (dir, pos), open in zip(neighbors(pos), map(is_door_open, hash[0:4])):
+    h = seed.copy()
+    h.update("".join(path).encode())
+    for (dir, pos), open in zip(neighbors(pos), open_doors(h.digest())):
         if is_valid(pos) and open:
-            yield 1, (pos, tuple(list(path) + [dir]))
+            yield 1, (pos, path + (dir,))
 
 
 def manhattan(a, b):
@@ -41,16 +45,21 @@ def manhattan(a, b):
 def part1(input):
     h = lambda node: manhattan(node[0], VAULT)
     is_target = lambda node: node[0] == VAULT
-    adj = partial(adjacent, input)
-    return "".join(astar(START, adj, h, is_target)[-1][1])
+    adj = partial(adjacent, hashlib.md5(input.encode()))
+    # Without a way to the vault the search ends once every door is closed.
+    path = astar(START, adj, h, is_target)
+    if path is None:
+        return None
+    return "".join(path[-1][1])
 
 
 def part2(input):
+    seed = hashlib.md5(input.encode())
     queue = set([START])
     longest = None
     while queue:
         node = queue.pop()
-        for _, n in adjacent(input, node):
+        for _, n in adjacent(seed, node):
             if n[0] == VAULT:
                 if longest is None or len(n[1]) > longest:
                     longest = len(n[1])
@@ -75,6 +84,7 @@ def test_part1():
     assert part1("ihgpwlah") == "DDRRRD"
     assert part1("kglvqrro") == "DDUDRLRRUDRD"
     assert part1("ulqzkmiv") == "DRURDRUDDLLDLUURRDULRLDUUDDDRR"
+    assert part1("hijkl") is None
 
 
 def test_part2():
@@ -2,53 +2,57 @@ def parse_input(input):
     return input.strip()
 
 
-def is_trap(c):
-    return c == "^"
-
-
-def deduce_tile(prev, i):
-    left = is_trap(prev[i - 1]) if i > 0 else False
-    center = is_trap(prev[i])
-    right = is_trap(prev[i + 1]) if i < len(prev) - 1 else False
-
-    trap = (
-        # left and center tiles are traps, but its right tile is not
-        (left and center and not right)
-        or
-        # center and right tiles are traps, but its left tile is not
-        (center and right and not left)
-        or
-        # only its left tile is a trap
-        (left and not center and not right)
-        or
-        # only its right tile is a trap
-        (right and not center and not left)
-    )
-
-    return "^" if trap else "."
-
-
-def next_row(prev):
-    return "".join(deduce_tile(prev, i) for i, _ in enumerate(prev))
-
-
-def make_rows(input, num):
-    prev = input
-    for _ in range(num):
-        yield prev
-        prev = next_row(prev)
-
-
-def count_safe(rows):
-    return sum(row.count(".") for row in rows)
+def parse_row(row):
+    # Bit i is set when tile i is a trap.
+    return sum(1 << i for i, c in enumerate(row) if c == "^"), len(row)
+
+
+# A tile is a trap when exactly one of its left and right tiles is a trap (the
+# center tile doesn't matter), so a whole row advances with one xor.
+def next_row(row, mask):
+    return ((row << 1) ^ (row >> 1)) & mask
+
+
+def rows(input):
+    row, width = parse_row(input)
+    mask = (1 << width) - 1
+    while True:
+        yield row
+        row = next_row(row, mask)
+
+
+def count_safe(input, num):
+    row, width = parse_row(input)
+    mask = (1 << width) - 1
+    total = 0
+    # Brent's cycle detection: the tortoise jumps to the current row at powers
+    # of two. Once the rows repeat, whole cycles are skipped.
+    tortoise, tortoise_total = row, 0
+    power = period = 1
+    i = 0
+    while i < num:
+        total += width - row.bit_count()
+        row = next_row(row, mask)
+        i += 1
+        if row == tortoise:
+            cycles = (num - i) // period
+            total += cycles * (total - tortoise_total)
+            i += cycles * period
+            tortoise, power = None, 0
+        elif power == period:
+            tortoise, tortoise_total = row, total
+            power *= 2
+            period = 0
+        period += 1
+    return total
 
 
 def part1(input):
-    return count_safe(make_rows(input, 40))
+    return count_safe(input, 40)
 
 
 def part2(input):
-    return count_safe(make_rows(input, 400000))
+    return count_safe(input, 400000)
 
 
 def main():
@@ -64,4 +68,14 @@ if __name__ == "__main__":
 
 
 def test_part1():
-    assert count_safe(make_rows(".^^.^.^^^^", 10)) == 38
+    assert count_safe(".^^.^.^^^^", 10) == 38
+
+
+def test_cycle():
+    for input in [".^^.^.^^^^", "^..^", "^^.^.", ".^....^^.^^^...^"]:
+        width = len(input)
+        for num in [1, 10, 100, 1000]:
+            expected = sum(
+                width - row.bit_count() for row, _ in zip(rows(input), range(num))
+            )
+            assert count_safe(input, num) == expected
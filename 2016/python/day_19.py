@@ -1,31 +1,86 @@
+import sys
+from collections import deque
+from timeit import timeit
+
+
 def parse_input(input):
     return int(input.strip())
 
 
-def part1(input):
-    elves = [1] * input
-    next = {i: (i + 1) % input for i in range(input)}
+def largest_power(base, n):
+    p = 1
+    while p * base <= n:
+        p *= base
+    return p
+
+
+# Closed forms (https://en.wikipedia.org/wiki/Josephus_problem) for the elf
+# that ends up with all presents, numbered from 1.
+def steal_left(n):
+    return 2 * (n - largest_power(2, n)) + 1
+
+
+def steal_across(n):
+    p = largest_power(3, n)
+    if n == p:
+        return n
+    elif n <= 2 * p:
+        return n - p
+    else:
+        return 2 * n - 3 * p
+
+
+def simulate(n, offset):
+    # Each turn the current elf steals from the elf `offset(m)` places to its
+    # left, m being the number of elves left. The circle is split in two
+    # deques: `left` runs from the current elf up to the victim, `right` from
+    # the victim back around. That's O(1) per turn as long as the offset only
+    # changes by a few places per turn.
+    d = offset(n)
+    left = deque(range(1, d + 1))
+    right = deque(range(d + 1, n + 1))
+    for m in range(n, 1, -1):
+        right.popleft()
+        right.append(left.popleft())
+        d = offset(m - 1)
+        while len(left) < d:
+            left.append(right.popleft())
+        while len(left) > d:
+            right.appendleft(left.pop())
+    return (left or right)[0]
+
+
+def simulate_linked(n):
+    # The original one by one elimination for stealing from the left.
+    next = {i: (i + 1) % n for i in range(n)}
     i = 0
     while True:
         j = next[i]
         if i == j:
             return i + 1
-
-        elves[i] += elves[j]
-        elves[j] = 0
-
         next[i] = next[j]
         i = next[j]
 
 
+def part1(input):
+    return steal_left(input)
+
+
 def part2(input):
-    for i in range(input):
-        if 3**i > input - 1:
-            start = 3 ** (i - 1)
-            if input <= start * 2:
-                return input - start
-            else:
-                return start + (input - start * 2) * 2
+    return steal_across(input)
+
+
+def bench():
+    for n in [10**3, 10**4, 10**5, 10**6, 10**7]:
+        runs = [
+            ("left closed form", lambda: steal_left(n)),
+            ("across closed form", lambda: steal_across(n)),
+            ("left deques", lambda: simulate(n, lambda m: 1)),
+            ("across deques", lambda: simulate(n, lambda m: m // 2)),
+            ("left linked", lambda: simulate_linked(n)),
+        ]
+        for name, fn in runs:
+            print(f"n={n:<9} {name:<19} {timeit(fn, number=1):.6f}s")
 
 
 def main():
@@ -37,7 +92,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        main()
 
 
 def test_part1():
@@ -46,3 +104,9 @@ def test_part1():
 
 def test_part2():
     assert part2(5) == 2
+
+
+def test_simulate():
+    for n in range(1, 200):
+        assert simulate(n, lambda m: 1) == steal_left(n) == simulate_linked(n)
+        assert simulate(n, lambda m: m // 2) == steal_across(n)
@@ -1,7 +1,7 @@
 import re
 from dataclasses import dataclass
 
-from astar import astar
+from search import astar
 
 
 @dataclass(frozen=True)
@@ -5,7 +5,7 @@ from functools import partial
 from operator import itemgetter
 from itertools import chain, count
 
-from astar import astar
+from search import astar
 
 
 def parse_input(input):
@@ -74,13 +74,9 @@ def scan_graph(input, start):
 
 
 def adjacent(graph, node):
-    v, points = node
+    v, visited = node
     for u, dist in graph[v].items():
-        yield dist, (u, points + (u,))
-
-
-def path_dist(graph, path):
-    return sum(graph[v[0]][u[0]] for v, u in zip(path, path[1:]))
+        yield dist, (u, visited | {u})
 
 
 def part1(input):
@@ -88,11 +84,10 @@ def part1(input):
     current = dict(points)["0"]
     graph = scan_graph(input, current)
 
-    start = ("0", ("0",))
-    h = lambda node: len(points) - len(set(node[1]))
-    is_target = lambda node: len(set(node[1])) == len(points)
-    path = astar(start, partial(adjacent, graph), h, is_target)
-    return path_dist(graph, path)
+    start = ("0", frozenset({"0"}))
+    h = lambda node: len(points) - len(node[1])
+    is_target = lambda node: len(node[1]) == len(points)
+    return astar(start, partial(adjacent, graph), h, is_target, path=False)
 
 
 def part2(input):
@@ -100,13 +95,13 @@ def part2(input):
     current = dict(points)["0"]
     graph = scan_graph(input, current)
 
-    start = ("0", ("0",))
-    h = lambda node: (1 + len(points)) - (
-        len(set(node[1])) + 1 if node[1][-1] == "0" else 0
+    start = ("0", frozenset({"0"}))
+    # Visit the remaining points, then one more step back to "0".
+    h = lambda node: (len(points) - len(node[1])) + (
+        0 if len(node[1]) == len(points) and node[0] == "0" else 1
     )
-    is_target = lambda node: len(set(node[1])) == len(points) and node[1][-1] == "0"
-    path = astar(start, partial(adjacent, graph), h, is_target)
-    return path_dist(graph, path)
+    is_target = lambda node: len(node[1]) == len(points) and node[0] == "0"
+    return astar(start, partial(adjacent, graph), h, is_target, path=False)
 
 
 def main():
@@ -1,39 +1,12 @@
-from itertools import islice, count
+from itertools import count
 
-
-def parse_input(input):
-    return [line.split() for line in input.strip().splitlines()]
-
-
-def reg_or_const(val, regs):
-    return regs[val] if val in regs else int(val)
-
-
-def run(prog, regs):
-    ip = 0
-    while 0 <= ip < len(prog):
-        instr = prog[ip]
-        ip += 1
-        if instr[0] == "cpy":
-            if instr[2] in regs:
-                regs[instr[2]] = reg_or_const(instr[1], regs)
-        elif instr[0] == "inc":
-            regs[instr[1]] += 1
-        elif instr[0] == "dec":
-            regs[instr[1]] -= 1
-        elif instr[0] == "jnz":
-            if reg_or_const(instr[1], regs) != 0:
-                ip += reg_or_const(instr[2], regs) - 1
-        elif instr[0] == "out":
-            yield reg_or_const(instr[1], regs)
-        else:
-            raise Exception(f"unknown instruction: {instr[0]}")
+from assembunny import parse_input, outputs
 
 
 def part1(input):
     for i in count(start=1):
         regs = dict(a=i, b=0, c=0, d=0)
-        if list(islice(run(input, regs), 8)) == [0, 1, 0, 1] * 2:
+        if list(outputs(input, regs, 8)) == [0, 1, 0, 1] * 2:
             return i
 
 
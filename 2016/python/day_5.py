@@ -1,5 +1,6 @@
-import hashlib
-from itertools import count, islice
+from itertools import islice
+
+import md5
 
 
 def parse_input(input):
@@ -7,10 +8,7 @@ def parse_input(input):
 
 
 def find_hashes(door):
-    for i in count(start=0):
-        hash = hashlib.md5(bytes(f"{door}{i}", "utf-8")).hexdigest()
-        if hash.startswith("00000"):
-            yield hash
+    return (hash for _, hash in md5.hashes(door, zeros=5))
 
 
 def part1(input):
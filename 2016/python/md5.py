@@ -0,0 +1,59 @@
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+
+CHUNK_SIZE = 1000
+
+
+def has_zeros(digest, zeros):
+    # Check for `zeros` leading zero hex digits on the raw digest.
+    whole, half = divmod(zeros, 2)
+    if any(digest[:whole]):
+        return False
+    return not half or digest[whole] < 0x10
+
+
+def hash_chunk(prefix, start, stop, stretch=0, zeros=0):
+    # The salt is hashed once, every index continues from a copy of that state.
+    seed = hashlib.md5(prefix)
+    result = []
+    for idx in range(start, stop):
+        h = seed.copy()
+        h.update(b"%d" % idx)
+        if stretch:
+            for _ in range(stretch):
+                h = hashlib.md5(h.hexdigest().encode())
+        elif zeros and not has_zeros(h.digest(), zeros):
+            continue
+        result.append((idx, h.hexdigest()))
+    return result
+
+
+# Yields (idx, hexdigest) of md5(f"{salt}{idx}") in order of idx. The hash is
+# re-hashed (as hex) `stretch` times. With `zeros` only the hashes starting with
+# that many zero hex digits are yielded. Chunks of indices are hashed on a
+# process pool, a few chunks ahead of the consumer.
+def hashes(salt, stretch=0, zeros=0, start=0, processes=None):
+    prefix = salt.encode()
+    processes = processes or os.cpu_count() or 1
+    chunks = count(start, CHUNK_SIZE)
+
+    if processes == 1:
+        for lo in chunks:
+            yield from hash_chunk(prefix, lo, lo + CHUNK_SIZE, stretch, zeros)
+
+    pool = ProcessPoolExecutor(processes)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < 2 * processes:
+                lo = next(chunks)
+                pending.append(
+                    pool.submit(hash_chunk, prefix, lo, lo + CHUNK_SIZE, stretch, zeros)
+                )
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
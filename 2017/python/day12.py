@@ -52,28 +52,19 @@
 # How many groups are there in total?
 #
 
+from unionfind import DisjointSet
 
-def find_connected(start, edges):
-    visited = set()
-    queue = [start]
 
-    for v in queue:
-        if v not in visited:
-            visited.add(v)
-            for n in edges[v]:
-                queue.append(n)
-
-    return visited
+def connect(edges):
+    sets = DisjointSet(edges)
+    for v, neighbours in edges.items():
+        for n in neighbours:
+            sets.union(v, n)
+    return sets
 
 
 def count_groups(edges):
-    vertices = set(edges.keys())
-    groups = 0
-    while len(vertices):
-        start = next(iter(vertices))
-        vertices = vertices - find_connected(start, edges)
-        groups += 1
-    return groups
+    return connect(edges).count
 
 
 def parse_line(line):
@@ -84,8 +75,9 @@ def parse_line(line):
 def main():
     with open("../input/day12.input.txt") as f:
         edges = dict([parse_line(line) for line in f.readlines()])
-        print(len(find_connected(0, edges)))
-        print(count_groups(edges))
+        sets = connect(edges)
+        print(sets.size(0))
+        print(sets.count)
 
 
 if __name__ == "__main__":
@@ -293,52 +293,38 @@
 #
 
 
-def move_into(layers, scanners, pos):
-    if scanners.get(pos) == 0:
-        return pos * layers[pos]
-    else:
-        return None
+BLOCK = 1 << 16
 
 
-def scan_cycle(layers, scanners):
-    # Scanners move up and down, emulate this with modulo (depth*2)-2
-    return {k: (v + 1) % ((layers[k] * 2) - 2) for k, v in scanners.items()}
+def period(range_):
+    # Scanners move up and down, back at the top every (range*2)-2 picoseconds.
+    return max(1, range_ * 2 - 2)
 
 
 def traverse(layers):
-    max_layer = max(layers.keys())
-    scanners = {k: 0 for k, _ in layers.items()}
-
-    cost = None
-    for pos in range(0, max_layer + 1):
-        new_cost = move_into(layers, scanners, pos)
-        if new_cost is not None:
-            if cost is None:
-                cost = new_cost
-            else:
-                cost += new_cost
-        scanners = scan_cycle(layers, scanners)
-
-    return cost
+    # Entering layer `depth` at time `depth` is caught when the scanner is at
+    # the top at that time.
+    return sum(
+        depth * range_
+        for depth, range_ in layers.items()
+        if depth % period(range_) == 0
+    )
 
 
 def go_undetected(layers):
-    max_layer = max(layers.keys())
-    start = scanners = {k: 0 for k, _ in layers.items()}
-    delay = 0
-    pos = 0
-
-    while pos <= max_layer:
-        if move_into(layers, scanners, pos) is not None:
-            pos = 0
-            # Backtrack to where we last started.
-            start = scanners = scan_cycle(layers, start)
-            delay += 1
-        else:
-            pos += 1
-            scanners = scan_cycle(layers, scanners)
-
-    return delay
+    # Every layer forbids the delays with delay = -depth (mod period). Sieve
+    # them out of blocks of candidate delays with slice assignments.
+    residues = {(period(r), -d % period(r)) for d, r in layers.items()}
+    start = 0
+    while True:
+        block = bytearray(b"\x01") * BLOCK
+        for p, residue in residues:
+            first = (residue - start) % p
+            block[first::p] = bytes(len(range(first, BLOCK, p)))
+        delay = block.find(1)
+        if delay != -1:
+            return start + delay
+        start += BLOCK
 
 
 def main():
@@ -63,48 +63,23 @@
 
 
 from day10_2 import knot_hash
-from day12 import count_groups
+from unionfind import label_regions
 
 
-def to_bits(dense_hash):
-    return "".join(map(lambda v: "{0:08b}".format(v), dense_hash))
-
-
-def is_valid(x, y):
-    return 0 <= x < 128 and 0 <= y < 128
-
-
-def square_id(x, y):
-    return y * 128 + x
+def disk_rows(key):
+    for row in range(0, 128):
+        yield int.from_bytes(bytes(knot_hash("{}-{}".format(key, row))), "big")
 
 
 def main():
     input = "xlqgujun"
-    grid = []
-    for row in range(0, 128):
-        row_bits = to_bits(knot_hash("{}-{}".format(input, row)))
-        grid.append([bool(int(i)) for i in row_bits])
-
-    # Transform to a graph
-    edges = []
-    for y in range(0, 128):
-        for x in range(0, 128):
-            if not grid[y][x]:
-                continue
-
-            neighbours = [(x - 1, y), (x, y + 1), (x + 1, y), (x, y - 1)]
-
-            my_edges = []
-            for (nx, ny) in neighbours:
-                if is_valid(nx, ny) and grid[ny][nx]:
-                    my_edges.append(square_id(nx, ny))
-
-            edges.append((square_id(x, y), my_edges))
+    rows = list(disk_rows(input))
 
     # Part 1: uses squares.
-    print(len(edges))
+    print(sum(row.bit_count() for row in rows))
     # Part 2: number of regions.
-    print(count_groups(dict(edges)))
+    count, _ = label_regions(rows)
+    print(count)
 
 
 if __name__ == "__main__":
@@ -108,11 +108,18 @@
 # After 5 million pairs, but using this new generator logic, what is the judge's final count?
 
 
+import numpy as np
+
+
+MODULUS = 2147483647
+BATCH = 1 << 20
+
+
 def make_gen(start, factor, mod=None):
     def gen():
         value = start
         while True:
-            value = (value * factor) % 2147483647
+            value = (value * factor) % MODULUS
             if mod is None or value % mod == 0:
                 yield value
 
@@ -129,14 +136,53 @@ def judge(ga, gb, num):
     return count
 
 
+def make_batches(start, factor, mod=None, size=BATCH):
+    # Same values as make_gen, in numpy arrays of up to `size` values. The
+    # next block follows from the last value by jumping ahead:
+    # value * factor^k % MODULUS, with all factor^k precomputed. Both operands
+    # are below 2^31, so the products fit in int64.
+    powers = np.empty(size, dtype=np.int64)
+    powers[0] = factor % MODULUS
+    filled = 1
+    while filled < size:
+        n = min(filled, size - filled)
+        powers[filled : filled + n] = powers[:n] * powers[filled - 1] % MODULUS
+        filled += n
+
+    value = start
+    while True:
+        block = value * powers % MODULUS
+        value = int(block[-1])
+        if mod is not None:
+            # The generators accept a different share of their values, so
+            # blocks can have different lengths.
+            block = block[block % mod == 0]
+        yield block & 0xFFFF
+
+
+def judge_batches(ga, gb, num):
+    count = 0
+    a = b = np.empty(0, dtype=np.int64)
+    while num > 0:
+        while len(a) < min(num, BATCH):
+            a = np.concatenate((a, next(ga)))
+        while len(b) < min(num, BATCH):
+            b = np.concatenate((b, next(gb)))
+        n = min(num, len(a), len(b))
+        count += int(np.count_nonzero(a[:n] == b[:n]))
+        a, b = a[n:], b[n:]
+        num -= n
+    return count
+
+
 def main():
-    ga = make_gen(289, 16807)
-    gb = make_gen(629, 48271)
-    print(judge(ga, gb, 40000000))
+    ga = make_batches(289, 16807)
+    gb = make_batches(629, 48271)
+    print(judge_batches(ga, gb, 40000000))
 
-    ga = make_gen(289, 16807, 4)
-    gb = make_gen(629, 48271, 8)
-    print(judge(ga, gb, 5000000))
+    ga = make_batches(289, 16807, 4)
+    gb = make_batches(629, 48271, 8)
+    print(judge_batches(ga, gb, 5000000))
 
 
 if __name__ == "__main__":
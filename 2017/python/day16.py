@@ -38,6 +38,9 @@
 #
 # In what order are the programs standing after their billion dances?
 
+import sys
+from timeit import timeit
+
 STEP = "s"
 EXCHANGE = "x"
 PARTNER = "p"
@@ -97,52 +100,6 @@ def compile_program(moves):
     yield ""
 
 
-def compile_move_c(move):
-    if move[0] == STEP:
-        return """// s{spin}
-spin = (spin + {spin}) % {count};
-""".format(
-            spin=move[1], count=COUNT
-        )
-    elif move[0] == EXCHANGE:
-        return """//# e{i}/{j}
-i = mod(({i} - spin), {count});
-j = mod(({j} - spin), {count});
-tmp = programs[i];
-programs[i] = programs[j];
-programs[j] = tmp;
-""".format(
-            i=move[1], j=move[2], count=COUNT
-        )
-    elif move[0] == PARTNER:
-        return """// p{a}/{b}
-for (int k = 0; k < {count}; k++) {{
-    if (programs[k] == '{a}') i = k;
-    if (programs[k] == '{b}') j = k;
-}}
-programs[i] = '{b}';
-programs[j] = '{a}';
-""".format(
-            a=move[1], b=move[2], count=COUNT
-        )
-
-
-def compile_program_c(moves):
-    yield "static inline int mod(int a, int b) {"
-    yield "int ret = a % b;"
-    yield "if (ret < 0) ret += b;"
-    yield "return ret;"
-    yield "}"
-    yield ""
-    yield "int compiled_dance(int spin, char *programs) {"
-    yield "char tmp;"
-    yield "int i, j;"
-    for move in moves:
-        yield compile_move_c(move)
-    yield "return spin;"
-    yield "}"
-
-
 def parse_move(str):
     t = str[0]
     if t == STEP:
@@ -165,40 +122,91 @@ def final_spin(spin, programs):
     return programs[-spin:] + programs[:-spin]
 
 
-def main():
-    with open("../input/day16.input.txt") as f:
-        moves = [parse_move(str) for str in f.read().split(",")]
+def compose(p, q):
+    # Permutation that applies p first, then q.
+    return [p[i] for i in q]
+
 
-    program = "\n".join(compile_program(moves))
+def power(p, n):
+    result = list(range(len(p)))
+    while n:
+        if n & 1:
+            result = compose(result, p)
+        p = compose(p, p)
+        n >>= 1
+    return result
 
-    with open("day16_dance.c", "w") as f:
-        c_program = "\n".join(compile_program_c(moves))
-        f.write(c_program)
 
+def reduce_moves(moves):
+    # Spin and exchange only depend on positions and partner only on names,
+    # so the whole dance splits into two independent permutations: `positions`
+    # maps every position to the position it takes its program from, `names`
+    # maps every name to the name that replaces it.
+    positions = list(range(COUNT))
+    names = list(range(COUNT))
+    for move in moves:
+        if move[0] == STEP:
+            positions = positions[-move[1] :] + positions[: -move[1]]
+        elif move[0] == EXCHANGE:
+            i, j = move[1], move[2]
+            positions[i], positions[j] = positions[j], positions[i]
+        elif move[0] == PARTNER:
+            i = names.index(ord(move[1]) - ord("a"))
+            j = names.index(ord(move[2]) - ord("a"))
+            names[i], names[j] = names[j], names[i]
+    return positions, names
+
+
+def permutation_dance(moves, times):
+    positions, names = reduce_moves(moves)
+    positions = power(positions, times)
+    names = power(names, times)
+    return "".join(chr(names[positions[i]] + ord("a")) for i in range(COUNT))
+
+
+def compiled_dance(moves, times):
+    # The previous approach: generate a Python function for the dance, run it
+    # until the line up repeats and skip all whole cycles.
     exports = dict()
-    exec(program, exports)
+    exec("\n".join(compile_program(moves)), exports)
     compiled_dance = exports["compiled_dance"]
 
-    # Find the cycle time.
-    history = list()
-    cycles = 0
+    seen = dict()
     spin = 0
     programs = init()
-    while True:
-        spin = compiled_dance(spin, programs)
+    for i in range(times):
         current = "".join(final_spin(spin, programs))
-        if current in history:
+        if current in seen:
+            rem = (times - i) % (i - seen[current])
+            for _ in range(rem):
+                spin = compiled_dance(spin, programs)
             break
-        history.append(current)
-        cycles += 1
-
-    cycle_time = cycles - history.index(current)
-    rem = (1000000000 - (cycles + 1)) % cycle_time
-    for i in range(0, rem):
+        seen[current] = i
         spin = compiled_dance(spin, programs)
 
-    print("".join(final_spin(spin, programs)))
+    return "".join(final_spin(spin, programs))
+
+
+def read_moves():
+    with open("../input/day16.input.txt") as f:
+        return [parse_move(str) for str in f.read().split(",")]
+
+
+def bench():
+    moves = read_moves()
+    for times in [1, 1000, 1000000000]:
+        for fn in [permutation_dance, compiled_dance]:
+            seconds = timeit(lambda: fn(moves, times), number=1)
+            print(f"{times:<10} {fn.__name__:<17} {seconds:.6f}s")
+
+
+def main():
+    moves = read_moves()
+    print(permutation_dance(moves, 1000000000))
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        main()
@@ -63,6 +63,11 @@
 #
 
 
+import sys
+from math import isqrt
+from timeit import timeit
+
+
 def spinlock(step_size, cycles):
     buffer = [0]
     pos = 0
@@ -72,11 +77,93 @@ def spinlock(step_size, cycles):
     return buffer, pos
 
 
+class BlockedList:
+    # A list split in blocks of about sqrt(n) values: an insert walks the
+    # block lengths and shifts one block, instead of the whole list.
+    def __init__(self, values=()):
+        self.blocks = [list(values)]
+        self.size = len(self.blocks[0])
+
+    def __len__(self):
+        return self.size
+
+    def locate(self, index):
+        for b, block in enumerate(self.blocks):
+            if index < len(block):
+                return b, index
+            index -= len(block)
+        return len(self.blocks) - 1, index + len(self.blocks[-1])
+
+    def __getitem__(self, index):
+        b, i = self.locate(index % self.size)
+        return self.blocks[b][i]
+
+    def insert(self, index, value):
+        b, i = self.locate(index)
+        block = self.blocks[b]
+        block.insert(i, value)
+        self.size += 1
+        limit = 2 * max(isqrt(self.size), 16)
+        if len(block) > limit:
+            half = len(block) // 2
+            self.blocks[b : b + 1] = [block[:half], block[half:]]
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+
+def spinlock_blocked(step_size, cycles):
+    buffer = BlockedList([0])
+    pos = 0
+    for i in range(0, cycles):
+        pos = 1 + (pos + step_size) % len(buffer)
+        buffer.insert(pos, i + 1)
+    return buffer, pos
+
+
+def value_after_zero(step_size, cycles):
+    # 0 never moves from the front, so only inserts at position 1 matter and
+    # the buffer itself isn't needed. Value v is inserted in a buffer of length
+    # v. Inserts that don't wrap around land at pos + step_size + 1, never at
+    # 1, so runs of them are skipped at once.
+    pos = 0
+    after = None
+    value = 1
+    while value <= cycles:
+        skip = -((pos + step_size - value) // step_size)
+        if skip > 0:
+            skip = min(skip, cycles - value + 1)
+            pos += skip * (step_size + 1)
+            value += skip
+            continue
+        pos = 1 + (pos + step_size) % value
+        if pos == 1:
+            after = value
+        value += 1
+    return after
+
+
+def bench():
+    for cycles in [2017, 20000, 200000]:
+        runs = [
+            ("list", lambda: spinlock(355, cycles)),
+            ("blocked", lambda: spinlock_blocked(355, cycles)),
+            ("after zero", lambda: value_after_zero(355, cycles)),
+        ]
+        for name, fn in runs:
+            print(f"{cycles:<7} {name:<10} {timeit(fn, number=1):.6f}s")
+
+
 def main():
-    buffer, pos = spinlock(355, 2017)
+    buffer, pos = spinlock_blocked(355, 2017)
     nextpos = (pos + 1) % len(buffer)
     print(buffer[nextpos])
+    print(value_after_zero(355, 50000000))
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        main()
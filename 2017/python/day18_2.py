@@ -93,106 +93,53 @@
 # Once both of your programs have terminated (regardless of what caused them to do so), how many times did program 1
 # send a value?
 
-from collections import namedtuple
+import sys
+from timeit import timeit
 
-Instruction = namedtuple("Instruction", "op args")
+from duet import Program, connect, decode, ring, schedule
 
 
-class Program:
-    def __init__(self, id, instructions):
-        self.id = id
-        self.instructions = instructions
-        self.pc = 0
-        self.register_file = dict({chr(ord("a") + i): 0 for i in range(0, 26)})
-        self.register_file["p"] = id
-        self.queue = []
-        self.waiting = False
-        self.receive_into = None
-        self.send = None
-        self.send_count = 0
+def duet(lines, n=2):
+    code, consts = decode(lines)
+    programs = [Program(i, code, consts) for i in range(n)]
+    connect(programs, ring(n))
+    schedule(programs)
+    return programs
 
-    def is_terminated(self):
-        return not (0 <= self.pc < len(self.instructions))
 
-    def step(self):
-        instr = self.instructions[self.pc]
-        if instr.op == "snd":
-            self.send(self.load(instr.args[0]))
-            self.send_count += 1
-        elif instr.op == "set":
-            arg = self.load(instr.args[1])
-            self.register_file[instr.args[0]] = arg
-        elif instr.op == "add":
-            arg = self.load(instr.args[1])
-            self.register_file[instr.args[0]] += arg
-        elif instr.op == "mul":
-            arg = self.load(instr.args[1])
-            self.register_file[instr.args[0]] *= arg
-        elif instr.op == "mod":
-            arg = self.load(instr.args[1])
-            self.register_file[instr.args[0]] %= arg
-        elif instr.op == "rcv":
-            try:
-                self.register_file[instr.args[0]] = self.queue.pop(0)
-            except IndexError:
-                self.waiting = True
-                self.receive_into = instr.args[0]
-        elif instr.op == "jgz":
-            x = self.load(instr.args[0])
-            if x > 0:
-                offset = self.load(instr.args[1])
-                self.pc += offset - 1
+# Every program puts a token on the ring and passes on the tokens it gets with
+# one less, so messages keep going round until the counts run out. The puzzle
+# program deadlocks within a few thousand instructions on more than 2 programs.
+RELAY = """set a 100000
+snd a
+rcv a
+add a -1
+snd a
+jgz a -3""".splitlines()
 
-        self.pc += 1
 
-    def receive(self, value):
-        if self.waiting:
-            self.register_file[self.receive_into] = value
-            self.waiting = False
-            self.receive_into = None
-        else:
-            self.queue.append(value)
-
-    def load(self, arg):
-        if type(arg) is int:
-            return arg
-        else:
-            return self.register_file[arg]
-
-
-def parse_arg(arg):
-    try:
-        return int(arg)
-    except ValueError:
-        return arg
-
-
-def parse_instr(line):
-    op, *args = line.split()
-    return Instruction(op=op, args=[parse_arg(arg) for arg in args])
+def bench():
+    with open("../input/day18.input.txt") as f:
+        puzzle = f.read().splitlines()
+    runs = [("puzzle", puzzle, 2)] + [("relay", RELAY, n) for n in [2, 4, 16]]
+    for name, lines, n in runs:
+        programs = []
+        seconds = timeit(lambda: programs.extend(duet(lines, n)), number=1)
+        executed = sum(p.executed for p in programs)
+        print(
+            f"{name:<6} {n:<3} programs {executed:>9} instructions"
+            f" {executed / seconds:,.0f}/s"
+        )
 
 
 def main():
     with open("../input/day18.input.txt") as f:
-        instructions = [parse_instr(line.strip()) for line in f.readlines()]
-        p0 = Program(0, instructions)
-        p1 = Program(1, instructions)
-        p0.send = p1.receive
-        p1.send = p0.receive
-
-        while (
-            not p0.is_terminated()
-            and not p1.is_terminated()
-            and not (p0.waiting and p1.waiting)
-        ):
-
-            if not p0.waiting:
-                p0.step()
-            if not p1.waiting:
-                p1.step()
-
-        print(p1.send_count)
+        programs = duet(f.read().splitlines())
+        print(programs[1].sent)
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        main()
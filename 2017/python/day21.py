@@ -1,3 +1,7 @@
+from collections import Counter
+from functools import cache
+
+
 def parse_grid(str):
     return str.split("/")
 
@@ -43,24 +47,33 @@ def compose(f, g):
     return lambda x: g(f(x))
 
 
-def convert(rules, grid):
-    trans = [
-        (unit, unit),
-        (flip_horz, flip_horz),
-        (flip_vert, flip_vert),
-        (rotate_90, rotate_270),
-        (rotate_180, rotate_180),
-        (rotate_270, rotate_90),
-        (compose(rotate_90, flip_vert), compose(flip_vert, rotate_270)),
-        (compose(rotate_90, flip_horz), compose(flip_horz, rotate_270)),
-    ]
+TRANSFORMATIONS = [
+    unit,
+    flip_horz,
+    flip_vert,
+    rotate_90,
+    rotate_180,
+    rotate_270,
+    compose(rotate_90, flip_vert),
+    compose(rotate_90, flip_horz),
+]
 
-    for rule, replacement in rules:
-        for f, g in trans:
-            if rule == f(grid):
-                return replacement
 
-    raise ValueError("no match found")
+def expand_rules(rules):
+    # Every orientation of a pattern maps to its replacement, so a subgrid
+    # converts with a single lookup.
+    return {
+        tuple(f(rule)): replacement
+        for rule, replacement in rules
+        for f in TRANSFORMATIONS
+    }
+
+
+def convert(rules, grid):
+    try:
+        return rules[tuple(grid)]
+    except KeyError:
+        raise ValueError("no match found")
 
 
 def iterate(rules, grid):
@@ -87,16 +100,41 @@ def run(rules, grid, num):
     return grid
 
 
+def count_on(rules, start, num):
+    # A 3x3 block grows to 4x4, 6x6 and 9x9 in three iterations without ever
+    # being split across its borders, and the 9x9 grid splits into nine 3x3
+    # blocks again. So only the number of each 3x3 block matters.
+    @cache
+    def children(block):
+        grid = run(rules, list(block), 3)
+        return [
+            tuple(row[j : j + 3] for row in grid[i : i + 3])
+            for i in range(0, 9, 3)
+            for j in range(0, 9, 3)
+        ]
+
+    @cache
+    def on_pixels(block, num):
+        return "".join(run(rules, list(block), num)).count("#")
+
+    blocks = Counter([tuple(start)])
+    for _ in range(num // 3):
+        next = Counter()
+        for block, n in blocks.items():
+            for child in children(block):
+                next[child] += n
+        blocks = next
+
+    return sum(n * on_pixels(block, num % 3) for block, n in blocks.items())
+
+
 def main():
     with open("../input/day21.input.txt") as f:
-        rules = [parse_rule(line) for line in f.readlines()]
+        rules = expand_rules(parse_rule(line) for line in f.readlines())
 
     start = [".#.", "..#", "###"]
-    grid = run(rules, start, 5)
-    print("".join(grid).count("#"))
-
-    grid = run(rules, start, 18)
-    print("".join(grid).count("#"))
+    print(count_on(rules, start, 5))
+    print(count_on(rules, start, 18))
 
 
 if __name__ == "__main__":
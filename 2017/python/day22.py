@@ -1,4 +1,6 @@
+import sys
 from enum import Enum
+from timeit import timeit
 
 
 class Dir(Enum):
@@ -94,19 +96,111 @@ def make_states(grid):
     return states
 
 
-def main():
+# Dense simulator: the grid is a flat bytearray of cell states, framed by BORDER
+# cells so that walking off the grid is noticed without bounds checks.
+CLEAN, WEAKENED, INFECTED, FLAGGED, BORDER = range(5)
+UP, RIGHT, DOWN, LEFT = range(4)
+
+# Maps a cell state to the next state and the number of right turns.
+RULES_PT1 = {CLEAN: (INFECTED, -1), INFECTED: (CLEAN, 1)}
+RULES_PT2 = {
+    CLEAN: (WEAKENED, -1),
+    WEAKENED: (INFECTED, 0),
+    INFECTED: (FLAGGED, 1),
+    FLAGGED: (CLEAN, 2),
+}
+
+PAD = 64
+
+
+def embed(rows, pad):
+    # Lays out `rows` with `pad` clean cells on each side and the frame around
+    # that. Returns the cells, the row width and the index of rows[0][0].
+    inner = len(rows[0]) + 2 * pad
+    width = inner + 2
+    edge = bytes([BORDER])
+    blank = edge + bytes(inner) + edge
+    cells = bytearray(edge * width)
+    for _ in range(pad):
+        cells += blank
+    for row in rows:
+        cells += edge + bytes(pad) + bytes(row) + bytes(pad) + edge
+    for _ in range(pad):
+        cells += blank
+    cells += edge * width
+    return cells, width, (pad + 1) * width + pad + 1
+
+
+def grow(cells, width, pos):
+    # Pads the grid by its own size on every side. `pos` is a border cell,
+    # returns the new cells, width and the index of that position.
+    height = len(cells) // width
+    rows = [cells[y * width + 1 : (y + 1) * width - 1] for y in range(1, height - 1)]
+    cells, new_width, origin = embed(rows, max(width, height))
+    y, x = divmod(pos, width)
+    return cells, new_width, origin + (y - 1) * new_width + (x - 1)
+
+
+def simulate(grid, bursts, rules):
+    next_state = bytearray(BORDER)
+    turns = [0] * (4 * BORDER)
+    for state, (new_state, right_turns) in rules.items():
+        next_state[state] = new_state
+        for dir in range(4):
+            turns[4 * state + dir] = (dir + right_turns) % 4
+
+    rows = [[INFECTED if c else CLEAN for c in row] for row in grid]
+    cells, width, origin = embed(rows, PAD)
+    pos = origin + len(grid) // 2 * width + len(grid[0]) // 2
+    steps = (-width, 1, width, -1)
+    dir = UP
+    num_infected = 0
+    for _ in range(bursts):
+        state = cells[pos]
+        if state == BORDER:
+            cells, width, pos = grow(cells, width, pos)
+            steps = (-width, 1, width, -1)
+            state = cells[pos]
+        new_state = next_state[state]
+        cells[pos] = new_state
+        if new_state == INFECTED:
+            num_infected += 1
+        dir = turns[4 * state + dir]
+        pos += steps[dir]
+
+    return num_infected
+
+
+def read_grid():
     with open("../input/day22.input.txt") as f:
-        grid = [[c == "#" for c in line.strip()] for line in f.readlines()]
+        return [[c == "#" for c in line.strip()] for line in f.readlines()]
+
 
-    height = len(grid)
-    width = len(grid[0])
-    init_pos = (width // 2, height // 2)
-    dir = Dir.UP
+def bench():
+    grid = read_grid()
+    init_pos = (len(grid[0]) // 2, len(grid) // 2)
     init_states = make_states(grid)
+    for bursts in [10000, 100000, 1000000]:
+        runs = [
+            (
+                "dict",
+                lambda: run_virus_pt2(dict(init_states), init_pos, Dir.UP, bursts),
+            ),
+            ("dense", lambda: simulate(grid, bursts, RULES_PT2)),
+        ]
+        for name, fn in runs:
+            t = timeit(fn, number=1)
+            print(f"{bursts:<8} {name:<6} {t:.6f}s {bursts / t:12.0f} bursts/s")
 
-    print(run_virus(dict(init_states), init_pos, dir, 10000))
-    print(run_virus_pt2(dict(init_states), init_pos, dir, 10000000))
+
+def main():
+    grid = read_grid()
+    print(simulate(grid, 10000, RULES_PT1))
+    print(simulate(grid, 10000000, RULES_PT2))
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        main()
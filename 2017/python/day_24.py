@@ -1,6 +1,5 @@
 import pytest
 from collections import defaultdict
-from functools import cmp_to_key
 
 
 def parse_input(input):
@@ -8,42 +7,69 @@ def parse_input(input):
 
 
 def connections(input):
+    # Maps a port to the (bit, other port, strength) of the components that have
+    # it, with component i as bit i of a used-mask. Doubles (a/a) are kept apart
+    # as (bit, strength) lists: arriving at their port, it never hurts to add
+    # them right away.
     conns = defaultdict(list)
-    for (a, b) in input:
-        conns[a].append(b)
-        conns[b].append(a)
-    return conns
-
-
-def enumerate_bridges(pipes):
-    queue = [([0], set())]
-    results = []
-    while len(queue):
-        (bridge, visited) = queue.pop()
-        for i, (a, b) in enumerate(pipes):
-            if i not in visited and bridge[-1] in (a, b):
-                new_visited = visited | {i}
-                other = a if bridge[-1] == b else b
-                new_bridge = bridge + [bridge[-1], other]
-                queue.append((new_bridge, new_visited))
-                results.append(new_bridge)
-    return results
+    doubles = defaultdict(list)
+    for i, (a, b) in enumerate(input):
+        bit = 1 << i
+        if a == b:
+            doubles[a].append((bit, a + b))
+        else:
+            conns[a].append((bit, b, a + b))
+            conns[b].append((bit, a, a + b))
+    return conns, doubles
+
+
+def best_bridges(input):
+    # Returns the strength of the strongest bridge and the (length, strength)
+    # of the longest one. The best way to extend a bridge only depends on its
+    # free port and the components used so far, which often repeat in another
+    # order, so that is memoised.
+    conns, doubles = connections(input)
+    memo = {}
+
+    def extend(port, used):
+        key = (port, used)
+        if key in memo:
+            return memo[key]
+
+        unused = [(bit, strength) for bit, strength in doubles[port] if not used & bit]
+        if unused:
+            bits = sum(bit for bit, _ in unused)
+            strength = sum(strength for _, strength in unused)
+            strongest, (length, length_strength) = extend(port, used | bits)
+            result = (
+                strongest + strength,
+                (length + len(unused), length_strength + strength),
+            )
+        else:
+            strongest = 0
+            longest = (0, 0)
+            for bit, other, strength in conns[port]:
+                if used & bit:
+                    continue
+                s, (length, length_strength) = extend(other, used | bit)
+                strongest = max(strongest, s + strength)
+                longest = max(longest, (length + 1, length_strength + strength))
+            result = (strongest, longest)
+
+        memo[key] = result
+        return result
+
+    return extend(0, 0)
 
 
 def part1(input):
-    return max(map(sum, enumerate_bridges(input)))
+    strongest, _ = best_bridges(input)
+    return strongest
 
 
 def part2(input):
-    def compare_length_and_strength(a, b):
-        if len(a) != len(b):
-            return len(a) - len(b)
-        else:
-            return sum(a) - sum(b)
-
-    return sum(
-        max(enumerate_bridges(input), key=cmp_to_key(compare_length_and_strength))
-    )
+    _, (_, strength) = best_bridges(input)
+    return strength
 
 
 def main():
@@ -76,3 +102,9 @@ def test_part1():
 
 def test_part2():
     assert part2(parse_input(EXAMPLE_DATA_1)) == 19
+
+
+def test_repeated_doubles():
+    input = [(0, 5), (5, 5), (5, 5)]
+    assert part1(input) == 25
+    assert part2(input) == 25
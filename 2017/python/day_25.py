@@ -37,21 +37,88 @@ def parse_input(input):
     return TuringMachine(begin_state, int(diag_steps), states)
 
 
+LEFT, RIGHT = -1, 1
+
+# The tape is a bytearray of 64-bit blocks, one bit per cell.
+CELLS = 64
+TAPE_SIZE = 1 << 10
+
+
+def compile_machine(machine):
+    # Numbers the states and flattens the transitions into a table indexed by
+    # 2 * state + value, with (write_value, move, next_state) entries.
+    index = {name: i for i, name in enumerate(machine.states)}
+    table = []
+    for name in machine.states:
+        for action in machine.states[name]:
+            move = LEFT if action.move_cursor == "left" else RIGHT
+            table.append((action.write_value, move, index[action.next_state]))
+    return index[machine.begin_state], table
+
+
+def run_block(table, state, block, offset, limit):
+    # Runs the machine on a single block until the head leaves it, or for at
+    # most `limit` steps. Returns the new block, the state, the offset of the
+    # head (-1 or CELLS once it left) and the number of steps taken.
+    steps = 0
+    while 0 <= offset < CELLS and steps < limit:
+        write, move, state = table[2 * state + (block >> offset & 1)]
+        block = block & ~(1 << offset) | write << offset
+        offset += move
+        steps += 1
+    return block, state, offset, steps
+
+
+def grow(tape):
+    # Triples the tape, keeping the old blocks in the middle. Returns the new
+    # tape and the number of blocks added in front.
+    pad = len(tape)
+    return bytearray(pad) + tape + bytearray(pad), pad // (CELLS // 8)
+
+
 def run(machine):
-    tape = {}
-    cursor = 0
-    state = machine.begin_state
-    for i in range(machine.diag_steps):
-        action = machine.states[state][tape.get(cursor, 0)]
-        tape[cursor] = action.write_value
-        cursor = cursor - 1 if action.move_cursor == "left" else cursor + 1
-        state = action.next_state
+    # Steps through a whole block at a time. What happens between entering
+    # and leaving a block only depends on the state, the block and where the
+    # head entered, so that is cached. The machine mostly sweeps back and forth
+    # over the same few blocks, which makes the cache very effective.
+    state, table = compile_machine(machine)
+    macros = {}
+    tape = bytearray(TAPE_SIZE * CELLS // 8)
+    blocks = memoryview(tape).cast("Q")
+    pos = len(blocks) // 2
+    offset = 0
+    steps = machine.diag_steps
+    while steps:
+        if not 0 <= pos < len(blocks):
+            blocks.release()
+            tape, origin = grow(tape)
+            blocks = memoryview(tape).cast("Q")
+            pos += origin
+
+        key = (state, blocks[pos], offset)
+        macro = macros.get(key)
+        if macro is None:
+            macro = run_block(table, state, blocks[pos], offset, steps)
+            if not 0 <= macro[2] < CELLS:
+                macros[key] = macro
+        elif macro[3] > steps:
+            macro = run_block(table, state, blocks[pos], offset, steps)
+
+        blocks[pos], state, offset, n = macro
+        steps -= n
+        if offset < 0:
+            pos -= 1
+            offset = CELLS - 1
+        elif offset == CELLS:
+            pos += 1
+            offset = 0
+    blocks.release()
     return tape
 
 
 def part1(input):
     tape = run(input)
-    return sum(tape.values())
+    return int.from_bytes(tape, "little").bit_count()
 
 
 def main():
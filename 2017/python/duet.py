@@ -0,0 +1,115 @@
+from collections import deque
+
+
+REGISTERS = 26
+
+SND, SET, ADD, SUB, MUL, MOD, RCV, JGZ, JNZ = range(9)
+
+OPS = dict(
+    snd=SND, set=SET, add=ADD, sub=SUB, mul=MUL, mod=MOD, rcv=RCV, jgz=JGZ, jnz=JNZ
+)
+
+
+def decode(lines):
+    # Decodes the program into (op, x, y) tuples of ints. Operands are indices
+    # into the register file: registers a-z first, followed by a slot for every
+    # constant. Returns the code and the constant values of those slots.
+    consts = {}
+
+    def slot(arg):
+        if arg.isalpha():
+            return ord(arg) - ord("a")
+        n = int(arg)
+        if n not in consts:
+            consts[n] = REGISTERS + len(consts)
+        return consts[n]
+
+    code = []
+    for line in lines:
+        op, *args = line.split()
+        x, y = (list(map(slot, args)) + [None])[:2]
+        code.append((OPS[op], x, y))
+    return code, sorted(consts, key=consts.get)
+
+
+class Program:
+    def __init__(self, id, code, consts):
+        self.id = id
+        self.code = code
+        self.regs = [0] * REGISTERS + consts
+        self.regs[ord("p") - ord("a")] = id
+        self.pc = 0
+        self.mailbox = deque()
+        self.targets = []
+        self.sent = 0
+        self.executed = 0
+
+    def is_terminated(self):
+        return not (0 <= self.pc < len(self.code))
+
+    def run(self):
+        # Runs until the program terminates or blocks on rcv.
+        code, regs, mailbox = self.code, self.regs, self.mailbox
+        pc = self.pc
+        executed = 0
+        while 0 <= pc < len(code):
+            op, x, y = code[pc]
+            executed += 1
+            if op == SET:
+                regs[x] = regs[y]
+            elif op == ADD:
+                regs[x] += regs[y]
+            elif op == SUB:
+                regs[x] -= regs[y]
+            elif op == MUL:
+                regs[x] *= regs[y]
+            elif op == MOD:
+                regs[x] %= regs[y]
+            elif op == JGZ:
+                if regs[x] > 0:
+                    pc += regs[y]
+                    continue
+            elif op == JNZ:
+                if regs[x] != 0:
+                    pc += regs[y]
+                    continue
+            elif op == SND:
+                for target in self.targets:
+                    target.mailbox.append(regs[x])
+                self.sent += 1
+            elif op == RCV:
+                if not mailbox:
+                    executed -= 1
+                    break
+                regs[x] = mailbox.popleft()
+            pc += 1
+        self.pc = pc
+        self.executed += executed
+
+
+def connect(programs, topology):
+    # `topology` maps a program index to the indices it sends to.
+    for i, targets in topology.items():
+        programs[i].targets = [programs[j] for j in targets]
+
+
+def ring(n):
+    return {i: [(i + 1) % n] for i in range(n)}
+
+
+def schedule(programs):
+    # Runs every program until it blocks, after that only programs that got a
+    # message are woken up. Returns the programs that are left waiting on rcv
+    # once nothing can make progress: a deadlock, unless that list is empty.
+    ready = deque(programs)
+    queued = set(p.id for p in programs)
+    while ready:
+        program = ready.popleft()
+        queued.discard(program.id)
+        program.run()
+        for target in program.targets:
+            if target.id not in queued and not target.is_terminated():
+                if target.mailbox:
+                    ready.append(target)
+                    queued.add(target.id)
+    return [p for p in programs if not p.is_terminated()]
@@ -1,112 +1,127 @@
 import pytest
+from array import array
 from collections import namedtuple
-from enum import Enum
-from functools import partial, reduce
-
-from astar import astar
 
 Position = namedtuple("Position", ["x", "y"])
 
+# Tools and region types are plain ints. A tool can be used in a region as
+# long as it doesn't have the same number as the region type.
+NEITHER, TORCH, CLIMBING_GEAR = range(3)
+ROCKY, WET, NARROW = range(3)
 
-class Tool(Enum):
-    NEITHER = 0
-    TORCH = 1
-    CLIMBING_GEAR = 2
-
+MODULO = 20183
 
-class RegionType(Enum):
-    ROCKY = 0
-    WET = 1
-    NARROW = 2
+# The grid grows by at least this many rows or columns at a time.
+BAND = 32
 
-    def tools(self):
-        if self is self.ROCKY:
-            return [Tool.TORCH, Tool.CLIMBING_GEAR]
-        elif self is self.WET:
-            return [Tool.NEITHER, Tool.CLIMBING_GEAR]
-        elif self is self.NARROW:
-            return [Tool.NEITHER, Tool.TORCH]
+# Search states are (y << X_BITS | x) << 2 | tool.
+X_BITS = 16
+X_MASK = (1 << X_BITS) - 1
 
-    def can_use(self, tool):
-        return tool in self.tools()
+# Moving costs 1 and switching tools 7, so the estimated total cost of a child
+# is at most 7 more than that of its parent: eight buckets in a ring suffice.
+BUCKETS = 8
 
 
 class Cave:
     def __init__(self, depth, target):
         self.depth = depth
         self.target = target
-        self.cache = {target: 0}
-
-    def geologic_index(self, pos):
-        if pos.y == 0:
-            return pos.x * 16807
-        elif pos.x == 0:
-            return pos.y * 48271
-        elif pos in self.cache:
-            return self.cache[pos]
-        else:
-            a = self.erosion_level(Position(pos.x - 1, pos.y))
-            b = self.erosion_level(Position(pos.x, pos.y - 1))
-            result = a * b
-            self.cache[pos] = result
-            return result
-
-    def erosion_level(self, pos):
-        return (self.geologic_index(pos) + self.depth) % 20183
-
-    def region_type(self, pos):
-        return RegionType(self.erosion_level(pos) % 3)
+        self.erosion = []
+        self.types = []
+        self.width = 0
+        self.height = 0
+        self.extend(target.x + 1, target.y + 1)
+
+    def extend(self, width, height):
+        # Fills the grid to at least `width` x `height` cells, row by row: a
+        # cell only depends on the cells to its left and above it.
+        width = max(width, self.width)
+        height = max(height, self.height)
+        target = self.target
+        depth = self.depth
+        above = None
+        for y in range(height):
+            if y < self.height:
+                row, types = self.erosion[y], self.types[y]
+            else:
+                row, types = array("H"), bytearray()
+                self.erosion.append(row)
+                self.types.append(types)
+
+            for x in range(len(row), width):
+                if y == 0:
+                    index = x * 16807
+                elif x == 0:
+                    index = y * 48271
+                elif x == target.x and y == target.y:
+                    index = 0
+                else:
+                    index = row[x - 1] * above[x]
+                level = (index + depth) % MODULO
+                row.append(level)
+                types.append(level % 3)
+            above = row
+
+        self.width = width
+        self.height = height
 
 
 def part1(cave):
-    return sum(
-        cave.region_type(Position(x, y)).value
-        for x in range(0, cave.target.x + 1)
-        for y in range(0, cave.target.y + 1)
-    )
-
-
-def manhattan(a, b):
-    return abs(a.x - b.x) + abs(a.y - b.y)
-
-
-def adjacent_positions(pos):
-    yield Position(pos.x + 1, pos.y)
-    yield Position(pos.x, pos.y + 1)
-    if pos.x > 0:
-        yield Position(pos.x - 1, pos.y)
-    if pos.y > 0:
-        yield Position(pos.x, pos.y - 1)
-
-
-def adjacent(cave, node):
-    pos, tool = node
-
-    for other_tool in cave.region_type(pos).tools():
-        if tool != other_tool:
-            yield 7, (pos, other_tool)
-
-    for next_pos in adjacent_positions(pos):
-        if cave.region_type(next_pos).can_use(tool):
-            yield 1, (next_pos, tool)
-
-
-def path_cost(path):
-    time = 0
-    for i in range(len(path) - 1):
-        if path[i + 1][1] != path[i][1]:
-            time += 7
-        else:
-            time += 1
-    return time
+    return sum(sum(row[: cave.target.x + 1]) for row in cave.types[: cave.target.y + 1])
 
 
+# A* over (x, y, tool) states encoded as ints, with a bucket queue keyed by
+# the estimated total cost. Entries that got superseded by a cheaper path are
+# skipped when their bucket comes up.
 def part2(cave):
-    start = (Position(0, 0), Tool.TORCH)
-    target = (cave.target, Tool.TORCH)
-    h = lambda node: manhattan(node[0], cave.target)
-    path = astar(start, partial(adjacent, cave), h, target)
-    return path_cost(path)
+    tx, ty = cave.target
+    goal = (ty << X_BITS | tx) << 2 | TORCH
+    dist = {TORCH: 0}
+    buckets = [[] for _ in range(BUCKETS)]
+    f = tx + ty
+    buckets[f % BUCKETS].append(TORCH)
+    pending = 1
+
+    while pending:
+        bucket = buckets[f % BUCKETS]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            tool = state & 3
+            y = state >> (X_BITS + 2)
+            x = state >> 2 & X_MASK
+            g = dist[state]
+            h = abs(x - tx) + abs(y - ty)
+            if g + h != f:
+                continue
+            if state == goal:
+                return g
+
+            types = cave.types
+            other = state ^ tool ^ (3 - types[y][x] - tool)
+            if other not in dist or g + 7 < dist[other]:
+                dist[other] = g + 7
+                buckets[(f + 7) % BUCKETS].append(other)
+                pending += 1
+
+            for nx, ny in ((x + 1, y), (x, y + 1), (x - 1, y), (x, y - 1)):
+                if nx < 0 or ny < 0:
+                    continue
+                if nx >= cave.width or ny >= cave.height:
+                    cave.extend(nx + BAND, ny + BAND)
+                    types = cave.types
+                if types[ny][nx] == tool:
+                    continue
+                child = (ny << X_BITS | nx) << 2 | tool
+                if child not in dist or g + 1 < dist[child]:
+                    dist[child] = g + 1
+                    child_f = g + 1 + abs(nx - tx) + abs(ny - ty)
+                    buckets[child_f % BUCKETS].append(child)
+                    pending += 1
+        f += 1
+
+    return None
 
 
 def main():
@@ -125,3 +140,5 @@ def test_part1():
 
 def test_part2():
     assert part2(Cave(510, Position(10, 10))) == 45
+    assert part2(Cave(84, Position(14, 8))) == 36
+    assert part2(Cave(11895, Position(11, 17))) == 42
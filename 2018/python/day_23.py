@@ -3,12 +3,15 @@ import re
 from collections import namedtuple
 from operator import attrgetter
 from functools import cmp_to_key, partial
+from heapq import heappush, heappop
 from pprint import pprint
-from itertools import combinations
+from itertools import combinations, count, product
 
 from dataclasses import dataclass
 import itertools
 
+import numpy as np
+
 
 @dataclass(eq=True, frozen=True)
 class Point:
@@ -96,7 +99,9 @@ def gauss(A):
     return x
 
 
-def part2(input):
+# Fast path: assumes the best point is the unique intersection of the planes
+# where the ranges of the largest fully overlapping cluster touch.
+def touching_planes(input):
     # Find the largest cluster by starting with the bot that overlaps with the
     # most other bots.
     overlapping = {a: [b for b in input if overlap(a, b)] for a in input}
@@ -148,6 +153,62 @@ def part2(input):
     return manhattan(Point(x, y, z), Point(0, 0, 0))
 
 
+CORNERS = np.array(list(product((0, 1), repeat=3)), dtype=np.int64)
+
+
+def origin_distance(lo, hi):
+    # Distance from the origin to the nearest point of the boxes [lo, hi].
+    return (np.maximum(lo, 0) + np.maximum(-hi, 0)).sum(axis=-1)
+
+
+# Splits boxes into octants, ordered by the number of bots in range of any point
+# in the box (an upper bound for every point inside), then by the distance to
+# the origin. The first box of a single point has the most bots in range and
+# is the closest one to the origin among those.
+def octree_search(input):
+    pos = np.array([(bot.x, bot.y, bot.z) for bot in input], dtype=np.int64)
+    radius = np.array([bot.r for bot in input], dtype=np.int64)
+
+    # The root box has to cover the ranges, not just the bots.
+    lo = (pos - radius[:, None]).min(axis=0)
+    hi = (pos + radius[:, None]).max(axis=0)
+    size = 1
+    while (lo + size <= hi).any():
+        size *= 2
+
+    tie = count()
+    bots = np.arange(len(input))
+    distance = origin_distance(lo, lo + size - 1)
+    queue = [(-len(bots), distance, size, next(tie), lo, bots)]
+    while queue:
+        _, distance, size, _, lo, bots = heappop(queue)
+        if size == 1:
+            return int(distance)
+
+        # Distances from the bots to each of the eight children at once.
+        size //= 2
+        children = lo + CORNERS * size
+        p = pos[bots]
+        lower = children[:, None, :] - p
+        upper = p - (children[:, None, :] + size - 1)
+        dist = (np.maximum(lower, 0) + np.maximum(upper, 0)).sum(axis=2)
+        in_range = dist <= radius[bots]
+        distances = origin_distance(children, children + size - 1)
+        for child, mask, distance in zip(children, in_range, distances):
+            child_bots = bots[mask]
+            if len(child_bots):
+                entry = (-len(child_bots), distance, size, next(tie), child, child_bots)
+                heappush(queue, entry)
+
+    return None
+
+
+def part2(input, fast=False):
+    if fast:
+        return touching_planes(input)
+    return octree_search(input)
+
+
 def main():
     with open("../input/day_23.txt", "r") as f:
         input = parse_input(f.read())
@@ -2,10 +2,6 @@ import pytest
 import re
 from dataclasses import dataclass
 from typing import List
-from functools import cmp_to_key
-from operator import attrgetter
-import copy
-import itertools
 
 
 @dataclass
@@ -20,27 +16,6 @@ class Group:
     immune: List[str]
     weak: List[str]
 
-    def effective_power(self):
-        return self.units * self.attack_damage
-
-    def compute_damage_from(self, other: "Group") -> int:
-        damage = other.effective_power()
-        if other.attack_type in self.weak:
-            damage = damage * 2
-        elif other.attack_type in self.immune:
-            damage = 0
-        return damage
-
-    def take_damage_from(self, other: "Group") -> int:
-        amount = self.compute_damage_from(other)
-        killed_units = min(self.units, amount // self.hp)
-        self.units -= killed_units
-        return killed_units
-
-    def name(self) -> str:
-        system_str = "Infection" if self.system == 1 else "Immune system"
-        return f"{system_str} group {self.idx+1}"
-
 
 def parse_group(system, idx, line):
     units, hp, attack_damage, initiative = map(int, re.findall("(\d+)", line))
@@ -71,111 +46,110 @@ def parse_input(input):
     ]
 
 
-def sort_for_target_selection(groups):
-    def compare(a, b):
-        diff = a.effective_power() - b.effective_power()
-        if diff != 0:
-            return diff
-        return a.initiative - b.initiative
-
-    return sorted(groups, key=cmp_to_key(compare), reverse=True)
-
-
-def select_target(attacker, defenders):
-    def compare(a, b):
-        diff = a.compute_damage_from(attacker) - b.compute_damage_from(attacker)
-        if diff != 0:
-            return diff
-        diff = a.effective_power() - b.effective_power()
-        if diff != 0:
-            return diff
-        return a.initiative - b.initiative
-
-    target = max(defenders, key=cmp_to_key(compare))
-    if target.compute_damage_from(attacker) == 0:
-        return None
-    else:
-        return target
-
-
-def debug_print(*args):
-    # print(*args)
-    pass
-
-
-def target_selection(attackers, defenders):
-    selection = [None] * len(attackers)
-    defenders = [d for d in defenders if d.units > 0]
-    for attacker in sort_for_target_selection(attackers):
-        if len(defenders) == 0:
-            break
-        target = select_target(attacker, defenders)
-        if target:
-            selection[attacker.idx] = (target.system, target.idx)
-            defenders = [d for d in defenders if d != target]
-            debug_print(
-                f"{attacker.name()} would deal {target.name()} {target.compute_damage_from(attacker)} damage"
-            )
-        else:
-            debug_print(f"{attacker.name()} could not find a defending group to attack")
-    return selection
-
-
-def round(input):
-    total_units_killed = 0
-    a, b = input
-    selection = [target_selection(a, b), target_selection(b, a)]
-    debug_print()
-    for attacker in sorted(a + b, key=attrgetter("initiative"), reverse=True):
-        target = selection[attacker.system][attacker.idx]
-        if target:
-            system, group = target
-            units_killed = input[system][group].take_damage_from(attacker)
-            debug_print(
-                f"{attacker.name()} attacks {input[system][group].name()}, killing {units_killed} units"
-            )
-            total_units_killed += units_killed
-    return total_units_killed
-
-
-def sum_units(system):
-    return sum(map(attrgetter("units"), system))
-
-
-def game_over(input):
-    return any((sum_units(s) == 0 for s in input))
-
-
-def run(input):
-    input = copy.deepcopy(input)
-    while not game_over(input):
-        debug_print()
-        if round(input) == 0:
-            return None
-        debug_print()
-        for system in input:
-            for group in system:
-                debug_print(f"{group.name()} contains {group.units} units")
-    debug_print()
-    return [sum_units(s) for s in input]
+def multiplier(attacker, defender):
+    if attacker.system == defender.system or attacker.attack_type in defender.immune:
+        return 0
+    return 2 if attacker.attack_type in defender.weak else 1
+
+
+# Struct-of-arrays view of both armies: group i of the immune system and the
+# infection alike is index i in every list. The damage multiplier of every
+# attacker against every defender is computed up front.
+class Combat:
+    def __init__(self, input, boost=0):
+        groups = [group for system in input for group in system]
+        self.system = [group.system for group in groups]
+        self.units = [group.units for group in groups]
+        self.hp = [group.hp for group in groups]
+        self.damage = [
+            group.attack_damage + (boost if group.system == 0 else 0)
+            for group in groups
+        ]
+        self.initiative = [group.initiative for group in groups]
+        self.multiplier = [[multiplier(a, d) for d in groups] for a in groups]
+        # Initiative never changes, so neither does the order of attacks.
+        self.attack_order = sorted(
+            range(len(groups)), key=self.initiative.__getitem__, reverse=True
+        )
+
+    def select_targets(self, alive):
+        units, damage, initiative = self.units, self.damage, self.initiative
+        power = {i: units[i] * damage[i] for i in alive}
+        targets = {}
+        taken = set()
+        for i in sorted(alive, key=lambda i: (power[i], initiative[i]), reverse=True):
+            multiplier = self.multiplier[i]
+            best = None
+            best_key = None
+            for j in alive:
+                if multiplier[j] and j not in taken:
+                    key = (multiplier[j], power[j], initiative[j])
+                    if best_key is None or key > best_key:
+                        best, best_key = j, key
+            if best is not None:
+                targets[i] = best
+                taken.add(best)
+        return targets
+
+    # Returns the units left in each system, or None on a stalemate: a round in
+    # which no unit died.
+    def fight(self):
+        units, damage, hp = self.units, self.damage, self.hp
+        alive = [i for i in range(len(units)) if units[i]]
+        while len(set(self.system[i] for i in alive)) > 1:
+            targets = self.select_targets(alive)
+            killed = 0
+            for i in self.attack_order:
+                if i in targets and units[i]:
+                    j = targets[i]
+                    amount = units[i] * damage[i] * self.multiplier[i][j]
+                    dead = min(units[j], amount // hp[j])
+                    units[j] -= dead
+                    killed += dead
+            if killed == 0:
+                return None
+            alive = [i for i in alive if units[i]]
+
+        result = [0, 0]
+        for i in alive:
+            result[self.system[i]] += units[i]
+        return result
+
+
+def run(input, boost=0):
+    return Combat(input, boost).fight()
 
 
 def part1(input):
     return max(run(input))
 
 
-def boost(input, amount):
-    result = copy.deepcopy(input)
-    for group in result[0]:
-        group.attack_damage += amount
-    return result
-
-
 def part2(input):
-    for amount in itertools.count(start=1):
-        result = run(boost(input, amount))
-        if result and result[0] != 0:
-            return result[0]
+    # Find a winning boost by doubling, then bisect for the smallest one.
+    # Outcomes are cached, as the bisection can come back to a boost it already
+    # fought. This assumes winning is monotonic in the boost: once a boost wins,
+    # every larger boost wins too. A stalemate counts as a loss.
+    outcomes = {}
+
+    def outcome(amount):
+        if amount not in outcomes:
+            outcomes[amount] = run(input, amount)
+        return outcomes[amount]
+
+    def wins(amount):
+        result = outcome(amount)
+        return result is not None and result[0] != 0
+
+    lo, hi = 0, 1
+    while not wins(hi):
+        lo, hi = hi, hi * 2
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if wins(mid):
+            hi = mid
+        else:
+            lo = mid
+    return outcome(hi)[0]
 
 
 def main():
@@ -1,9 +1,12 @@
 import pytest
-from itertools import combinations
+from collections import defaultdict
+from itertools import combinations, product
 from typing import List
 import operator
 import copy
 
+from unionfind import DisjointSet
+
 
 def manhattan(a, b) -> int:
     return sum(abs(pa - pb) for (pa, pb) in zip(a, b))
@@ -13,24 +16,58 @@ def parse_input(input):
     return [tuple(map(int, line.split(","))) for line in input.strip().splitlines()]
 
 
-def part1(input):
-    constellations = []
-    for p in input:
-        matched = None
-        for c in constellations:
-            if any(manhattan(p, v) <= 3 for v in c):
-                if matched is None:
-                    c.add(p)
-                    matched = c
-                else:
-                    matched.update(c)
-                    c.clear()
-
-        if matched is None:
-            constellations.append(set([p]))
-
-        constellations = [c for c in constellations if len(c)]
+# Clusters points into constellations as they come in. Points are bucketed in
+# a grid with cells as wide as the maximum distance, so a point can only be
+# close to points in its own cell or a neighbouring one. Cells are keyed by a
+# single int, CELL_BITS per coordinate, so that stepping to a neighbour is an
+# addition.
+CELL_BITS = 32
+
+
+class Constellations:
+    def __init__(self, distance=3, dimensions=4):
+        self.distance = distance
+        # Points in cells that differ on more axes than `distance` are at least
+        # one apart on each of those axes.
+        self.neighbours = [
+            self.key(offset)
+            for offset in product((-1, 0, 1), repeat=dimensions)
+            if sum(map(abs, offset)) <= distance
+        ]
+        self.cells = defaultdict(list)
+        self.sets = DisjointSet()
+
+    def key(self, cell):
+        key = 0
+        for c in cell:
+            key = (key << CELL_BITS) + c
+        return key
+
+    def add(self, p):
+        if p in self.sets:
+            return
+        self.sets.add(p)
+        cell = self.key([c // self.distance for c in p])
+        cells = self.cells
+        for offset in self.neighbours:
+            neighbour = cell + offset
+            if neighbour in cells:
+                for q in cells[neighbour]:
+                    if manhattan(p, q) <= self.distance:
+                        self.sets.union(p, q)
+        cells[cell].append(p)
+
+    def update(self, points):
+        for p in points:
+            self.add(p)
+
+    def __len__(self):
+        return self.sets.count
 
+
+def part1(input):
+    constellations = Constellations()
+    constellations.update(input)
     return len(constellations)
 
 
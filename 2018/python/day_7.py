@@ -1,4 +1,6 @@
 import re
+from collections import defaultdict
+from heapq import heapify, heappush, heappop
 from itertools import chain
 
 
@@ -11,26 +13,60 @@ def parse_input(input):
     ]
 
 
-def dependency_graph(input):
-    steps = set(chain(*input))
-    return {k: set(a for (a, b) in input if b == k) for k in steps}
+class Scheduler:
+    # Kahn's algorithm: counts the unfinished prerequisites of every step and
+    # keeps the steps that have none left in a min-heap.
+    def __init__(self, input):
+        self.successors = defaultdict(list)
+        self.waiting_for = {k: 0 for k in chain(*input)}
+        for a, b in input:
+            self.successors[a].append(b)
+            self.waiting_for[b] += 1
+        self.ready = [k for k, n in self.waiting_for.items() if n == 0]
+        heapify(self.ready)
+
+    def next(self):
+        return heappop(self.ready)
+
+    def finish(self, step):
+        for k in self.successors[step]:
+            self.waiting_for[k] -= 1
+            if self.waiting_for[k] == 0:
+                heappush(self.ready, k)
 
 
 def part1(input):
-    graph = dependency_graph(input)
-    visited = set()
+    scheduler = Scheduler(input)
     result = []
-    while len(graph):
-        steps = [k for k, deps in graph.items() if deps.issubset(visited)]
-        k = sorted(steps)[0]
-        del graph[k]
-        visited.add(k)
-        result.append(k)
+    while scheduler.ready:
+        step = scheduler.next()
+        scheduler.finish(step)
+        result.append(step)
     return "".join(result)
 
 
-def part2(input):
-    pass
+def duration(step, base):
+    return base + ord(step) - ord("A") + 1
+
+
+# Idle workers take the first ready steps, then time jumps to the next step
+# that finishes. Steps finishing at the same time are all done before any
+# worker picks a new step.
+def part2(input, workers=5, base=60):
+    scheduler = Scheduler(input)
+    running = []
+    time = 0
+    while scheduler.ready or running:
+        while scheduler.ready and len(running) < workers:
+            step = scheduler.next()
+            heappush(running, (time + duration(step, base), step))
+
+        time, step = heappop(running)
+        scheduler.finish(step)
+        while running and running[0][0] == time:
+            _, step = heappop(running)
+            scheduler.finish(step)
+    return time
 
 
 def main():
@@ -58,3 +94,7 @@ Step F must be finished before step E can begin.
 
 def test_part1_example1():
     assert part1(parse_input(EXAMPLE_DATA_1)) == "CABDFE"
+
+
+def test_part2_example1():
+    assert part2(parse_input(EXAMPLE_DATA_1), workers=2, base=0) == 15
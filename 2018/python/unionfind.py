@@ -0,0 +1 @@
+../../python/unionfind.py
\ No newline at end of file
@@ -5,7 +5,7 @@ from functools import partial
 from operator import itemgetter
 from itertools import chain, count
 
-from astar import astar
+from search import astar
 
 
 def parse_input(input):
@@ -84,15 +84,6 @@ def adjacent(graph, node):
             yield dist, (u, keys)
 
 
-def path_dist(graph, path):
-    dist = 0
-    v = path[0]
-    for u in path[1:]:
-        dist += graph[v[0]][u[0]]
-        v = u
-    return dist
-
-
 def part1(input):
     vertices = list(find_vertices(input))
     num_keys = sum(1 for v, _ in vertices if v.islower())
@@ -102,8 +93,7 @@ def part1(input):
     start = ("@", frozenset())
     h = lambda node: num_keys - len(node[1])
     is_target = lambda node: len(node[1]) == num_keys
-    path = astar(start, partial(adjacent, graph), h, is_target)
-    return path_dist(graph, path)
+    return astar(start, partial(adjacent, graph), h, is_target, path=False)
 
 
 def corners(point):
@@ -134,17 +124,6 @@ def adjacent_part2(graphs, node):
                 yield dist, (new_bots, keys)
 
 
-def path_dist_part2(graphs, path):
-    dist = 0
-    bots = list(path[0][0])
-    for next in path[1:]:
-        for i, (v, u) in enumerate(zip(bots, next[0])):
-            if u != v:
-                bots[i] = u
-                dist += graphs[i][v][u]
-    return dist
-
-
 def part2(input):
     vertices = list(find_vertices(input))
     num_keys = sum(1 for v, _ in vertices if v.islower())
@@ -160,8 +139,7 @@ def part2(input):
     start = (tuple("@" for e in entrances), frozenset())
     h = lambda node: num_keys - len(node[1])
     is_target = lambda node: len(node[1]) == num_keys
-    path = astar(start, partial(adjacent_part2, graphs), h, is_target)
-    return path_dist_part2(graphs, path)
+    return astar(start, partial(adjacent_part2, graphs), h, is_target, path=False)
 
 
 def main():
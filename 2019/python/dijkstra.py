@@ -1,20 +1,41 @@
-# https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm#Pseudocode
-def dijkstra(graph, source):
-    dist = {source: 0}
+from heapq import heappush, heappop
+from itertools import count
+
+
+# https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm#Using_a_priority_queue
+#
+# `graph` maps each vertex to a dict of {neighbour: distance}. All `sources`
+# start at distance 0. When `targets` is given the search stops as soon as
+# every target is settled; distances of vertices that weren't settled yet are
+# only upper bounds then. Returns `dist` and `prev`; with `paths=False` `prev`
+# isn't built and stays empty.
+def dijkstra(graph, *sources, targets=None, paths=True):
+    dist = {}
     prev = {}
-    queue = set(graph.keys())
+    tie = count()
+    queue = []
+    for source in sources:
+        dist[source] = 0
+        queue.append((0, next(tie), source))
+    remaining = set(targets) if targets is not None else None
 
     while queue:
-        u = min(queue, key=lambda v: dist[v] if v in dist else float("inf"))
-        queue.remove(u)
+        d, _, u = heappop(queue)
+        if d > dist[u]:
+            continue
+
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
 
-        for (v, d) in graph[u].items():
-            if v not in queue or u not in dist:
-                continue
-            alt = dist[u] + d
+        for v, w in graph.get(u, {}).items():
+            alt = d + w
             if v not in dist or alt < dist[v]:
                 dist[v] = alt
-                prev[v] = u
+                if paths:
+                    prev[v] = u
+                heappush(queue, (alt, next(tie), v))
 
     return dist, prev
 
@@ -23,6 +44,46 @@ def dijkstra_path(source, v, prev):
     path = []
     while True:
         v = prev[v]
-        if v == source:
+        # Sources have no predecessor; with multiple sources the path may
+        # start at another one than `source`.
+        if v == source or v not in prev:
             return path
         path.append(v)
+
+
+GRAPH = {
+    "a": {"b": 1, "c": 4},
+    "b": {"c": 2, "d": 5},
+    "c": {"d": 1},
+    "e": {"d": 1},
+    "f": {},
+}
+
+
+def test_dijkstra():
+    dist, prev = dijkstra(GRAPH, "a")
+    assert dist == {"a": 0, "b": 1, "c": 3, "d": 4}
+    assert dijkstra_path("a", "d", prev) == ["c", "b"]
+    # Unreachable vertices get no distance.
+    assert "e" not in dist and "f" not in dist
+
+    dist, prev = dijkstra(GRAPH, "a", paths=False)
+    assert dist["d"] == 4 and prev == {}
+
+
+def test_dijkstra_sources():
+    dist, prev = dijkstra(GRAPH, "a", "e")
+    assert dist == {"a": 0, "e": 0, "b": 1, "c": 3, "d": 1}
+    assert prev["d"] == "e"
+    assert dijkstra_path("a", "d", prev) == []
+
+
+def test_dijkstra_targets():
+    # Stops once "b" is settled: "c" only has an upper bound, "d" isn't seen.
+    dist, _ = dijkstra(GRAPH, "a", targets=["b"])
+    assert dist == {"a": 0, "b": 1, "c": 4}
+    dist, _ = dijkstra(GRAPH, "a", targets=["b", "d"])
+    assert dist["c"] == 3 and dist["d"] == 4
+    # An unreachable target lets the search run to the end.
+    dist, _ = dijkstra(GRAPH, "a", targets=["f"])
+    assert dist == {"a": 0, "b": 1, "c": 3, "d": 4}
@@ -1,6 +1,6 @@
 from functools import partial
 
-from astar import astar
+from search import astar
 
 
 def parse_input(input):
@@ -40,8 +40,8 @@ def adjacent(input, v):
 def shortest_path(input, start):
     is_target = lambda v: input[v] == "E"
     h = lambda _: 1
-    path = astar(start, partial(adjacent, input), h, is_target)
-    return len(path) - 1 if path is not None else float("inf")
+    cost = astar(start, partial(adjacent, input), h, is_target, path=False)
+    return cost if cost is not None else float("inf")
 
 
 def part1(input):
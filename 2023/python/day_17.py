@@ -55,9 +55,8 @@ def shortest_path(input, ultra):
     is_target = lambda n: n[0] == end and (not ultra or n[2] >= 4)
     adj = partial(adjacent, input, ultra)
     h = lambda n: n[0].manhattan(end)
-    path = astar(start, adj, h, is_target)
-    # print_path(input, path)
-    return sum(input[v.y][v.x] for v, _, _ in path[1:])
+    # print_path(input, astar(start, adj, h, is_target))
+    return astar(start, adj, h, is_target, path=False)
 
 
 def part1(input):
@@ -1,6 +1,6 @@
 from enum import Enum
 from dataclasses import dataclass
-from astar import astar
+from search import astar
 from typing import Callable
 
 
@@ -0,0 +1 @@
+../../python/search.py
\ No newline at end of file
@@ -1,4 +1,4 @@
-from lib import Vector, astar
+from lib import Vector, bfs
 
 
 def parse_input(input):
@@ -7,27 +7,25 @@ def parse_input(input):
     ]
 
 
-def find_path(input, size, n):
+def find_path(input, size, n, path=True):
     corrupted = set(input[:n])
     start = Vector(0, 0)
     finish = Vector(size, size)
 
-    h = lambda _: 1
     is_target = lambda n: n == finish
 
-    def adjacent(n):
+    def neighbours(n):
         return [
-            (1, n)
+            n
             for n in n.neighbors()
             if n not in corrupted and 0 <= n.x <= size and 0 <= n.y <= size
         ]
 
-    return astar(start, adjacent, h, is_target)
+    return bfs(start, neighbours, is_target, path)
 
 
 def part1(input, size=70, n=1024):
-    cost, _ = find_path(input, size, n)
-    return cost - 1
+    return find_path(input, size, n, path=False)
 
 
 def part2(input, size=70, start=1024):
@@ -35,11 +33,9 @@ def part2(input, size=70, start=1024):
     for n in range(start, len(input)):
         corrupted = input[n - 1]
         if path is None or corrupted in path:
-            try:
-                _, path = find_path(input, size, n)
-            except:
-                p = input[n - 1]
-                return f"{p.x},{p.y}"
+            path = find_path(input, size, n)
+            if path is None:
+                return f"{corrupted.x},{corrupted.y}"
 
 
 def main():
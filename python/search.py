@@ -0,0 +1,340 @@
+from heapq import heappush, heappop, nsmallest
+from itertools import count
+
+# Shared graph searches, symlinked into the <year>/python directories that use
+# them.
+#
+# `adjacent(node)` yields (cost, child) pairs, `h(node)` is an admissible
+# estimate of the remaining cost and `is_target(node)` ends the search. Heap
+# entries are plain tuples with a counter as tie-break, so nodes never have to
+# be comparable. Entries that got superseded by a cheaper path are skipped when
+# popped (lazy deletion) instead of being tracked in an open set.
+#
+# With `path=True` the searches return the path from start to target (both
+# included), with `path=False` only the cost of that path; `came_from` isn't
+# kept in that case. They return None when no target is reachable, or
+# BOUND_EXCEEDED when `max_cost` or `max_expansions` cut the search short
+# before a target was found.
+
+
+class _BoundExceeded:
+    def __repr__(self):
+        return "BOUND_EXCEEDED"
+
+    def __bool__(self):
+        return False
+
+
+BOUND_EXCEEDED = _BoundExceeded()
+
+
+def reconstruct_path(came_from, current):
+    path = [current]
+    while current in came_from:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+# https://en.wikipedia.org/wiki/A*_search_algorithm
+def astar(start, adjacent, h, is_target, path=True, max_cost=None, max_expansions=None):
+    tie = count()
+    queue = [(h(start), next(tie), 0, start)]
+    came_from = {}
+    g_score = {start: 0}
+    expansions = 0
+    pruned = False
+
+    while queue:
+        _, _, g, node = heappop(queue)
+        if g > g_score[node]:
+            continue
+
+        if is_target(node):
+            return reconstruct_path(came_from, node) if path else g
+
+        expansions += 1
+        if max_expansions is not None and expansions > max_expansions:
+            return BOUND_EXCEEDED
+
+        for cost, child in adjacent(node):
+            child_g = g + cost
+            if child not in g_score or child_g < g_score[child]:
+                f = child_g + h(child)
+                if max_cost is not None and f > max_cost:
+                    pruned = True
+                    continue
+                g_score[child] = child_g
+                if path:
+                    came_from[child] = node
+                heappush(queue, (f, next(tie), child_g, child))
+
+    return BOUND_EXCEEDED if pruned else None
+
+
+# Bidirectional Dijkstra between a single `start` and `goal`. `reverse_adjacent`
+# yields (cost, parent) pairs for the edges leading into a node. The side with
+# the smaller queue is expanded, and the search stops once the two queue heads
+# together can't beat the best meeting point found so far.
+def bidirectional(
+    start,
+    goal,
+    adjacent,
+    reverse_adjacent,
+    path=True,
+    max_cost=None,
+    max_expansions=None,
+):
+    if start == goal:
+        return [start] if path else 0
+
+    tie = count()
+    forward = ([(0, next(tie), start)], {start: 0}, {}, adjacent)
+    backward = ([(0, next(tie), goal)], {goal: 0}, {}, reverse_adjacent)
+    best = None
+    meet = None
+    expansions = 0
+    pruned = False
+
+    while forward[0] and backward[0]:
+        if best is not None and forward[0][0][0] + backward[0][0][0] >= best:
+            break
+
+        if len(forward[0]) <= len(backward[0]):
+            (queue, g_score, came_from, adj), other = forward, backward
+        else:
+            (queue, g_score, came_from, adj), other = backward, forward
+        other_g_score = other[1]
+
+        g, _, node = heappop(queue)
+        if g > g_score[node]:
+            continue
+
+        expansions += 1
+        if max_expansions is not None and expansions > max_expansions:
+            return BOUND_EXCEEDED
+
+        for cost, child in adj(node):
+            child_g = g + cost
+            if max_cost is not None and child_g > max_cost:
+                pruned = True
+                continue
+            if child not in g_score or child_g < g_score[child]:
+                g_score[child] = child_g
+                if path:
+                    came_from[child] = node
+                heappush(queue, (child_g, next(tie), child))
+                if child in other_g_score:
+                    total = child_g + other_g_score[child]
+                    if best is None or total < best:
+                        best, meet = total, child
+
+    if best is None or (max_cost is not None and best > max_cost):
+        return BOUND_EXCEEDED if pruned or best is not None else None
+    if not path:
+        return best
+
+    result = reconstruct_path(forward[2], meet)
+    current = meet
+    while current in backward[2]:
+        current = backward[2][current]
+        result.append(current)
+    return result
+
+
+# https://en.wikipedia.org/wiki/Beam_search
+#
+# Expands the search one layer at a time and only keeps the `width` children
+# with the lowest `h` for the next layer (greedy, `h` doesn't have to be
+# admissible). This isn't exhaustive: the result needn't be optimal and can be
+# None even if a target is reachable. `width=1` is a plain greedy descent.
+def beam_search(start, adjacent, h, is_target, width, path=True):
+    came_from = {}
+    g_score = {start: 0}
+    layer = [start]
+
+    while layer:
+        targets = [node for node in layer if is_target(node)]
+        if targets:
+            node = min(targets, key=g_score.__getitem__)
+            return reconstruct_path(came_from, node) if path else g_score[node]
+
+        children = []
+        for node in layer:
+            g = g_score[node]
+            for cost, child in adjacent(node):
+                child_g = g + cost
+                if child not in g_score:
+                    children.append(child)
+                elif child_g >= g_score[child]:
+                    continue
+                g_score[child] = child_g
+                if path:
+                    came_from[child] = node
+        layer = nsmallest(width, children, key=h)
+
+    return None
+
+
+# https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm#Using_a_priority_queue
+def dijkstra(start, adjacent, is_target, path=True):
+    tie = count()
+    queue = [(0, next(tie), start)]
+    came_from = {}
+    g_score = {start: 0}
+
+    while queue:
+        g, _, node = heappop(queue)
+        if g > g_score[node]:
+            continue
+
+        if is_target(node):
+            return reconstruct_path(came_from, node) if path else g
+
+        for cost, child in adjacent(node):
+            child_g = g + cost
+            if child not in g_score or child_g < g_score[child]:
+                g_score[child] = child_g
+                if path:
+                    came_from[child] = node
+                heappush(queue, (child_g, next(tie), child))
+
+    return None
+
+
+# Unweighted graphs: `neighbours(node)` yields child nodes without a cost. The
+# search goes one layer at a time, so the cost is the number of layers and only
+# the visited set is needed next to `came_from`.
+def bfs(start, neighbours, is_target, path=True):
+    if is_target(start):
+        return [start] if path else 0
+
+    came_from = {}
+    visited = {start}
+    layer = [start]
+    depth = 0
+
+    while layer:
+        depth += 1
+        next_layer = []
+        for node in layer:
+            for child in neighbours(node):
+                if child in visited:
+                    continue
+                visited.add(child)
+                if path:
+                    came_from[child] = node
+                if is_target(child):
+                    return reconstruct_path(came_from, child) if path else depth
+                next_layer.append(child)
+        layer = next_layer
+
+    return None
+
+
+# Dijkstra that keeps every predecessor on a shortest path. Returns the cost and
+# a generator over all shortest paths to all targets reached at that cost, or
+# None when no target is reachable.
+def all_shortest_paths(start, adjacent, is_target):
+    tie = count()
+    queue = [(0, next(tie), start)]
+    came_from = {start: []}
+    g_score = {start: 0}
+    best = None
+    targets = []
+
+    while queue:
+        g, _, node = heappop(queue)
+        if g > g_score[node]:
+            continue
+        if best is not None and g > best:
+            break
+
+        if is_target(node):
+            best = g
+            targets.append(node)
+            continue
+
+        for cost, child in adjacent(node):
+            child_g = g + cost
+            if child not in g_score or child_g < g_score[child]:
+                g_score[child] = child_g
+                came_from[child] = [node]
+                heappush(queue, (child_g, next(tie), child))
+            elif child_g == g_score[child]:
+                came_from[child].append(node)
+
+    if best is None:
+        return None
+
+    def paths():
+        stack = [[t] for t in targets]
+        while stack:
+            partial = stack.pop()
+            prev = came_from[partial[-1]]
+            if not prev:
+                yield partial[::-1]
+            for p in prev:
+                stack.append(partial + [p])
+
+    return best, paths()
+
+
+def test_bidirectional():
+    import random
+
+    def random_graph(seed, nodes=30, edges=80):
+        rng = random.Random(seed)
+        graph = {n: [] for n in range(nodes)}
+        for _ in range(edges):
+            graph[rng.randrange(nodes)].append(
+                (rng.randint(1, 9), rng.randrange(nodes))
+            )
+        return graph
+
+    def reverse_graph(graph):
+        reverse = {n: [] for n in graph}
+        for a, edges in graph.items():
+            for cost, b in edges:
+                reverse[b].append((cost, a))
+        return reverse
+
+    def path_cost(graph, path):
+        return sum(
+            min(cost for cost, child in graph[a] if child == b)
+            for a, b in zip(path, path[1:])
+        )
+
+    for seed in range(50):
+        graph = random_graph(seed)
+        reverse = reverse_graph(graph)
+        for goal in range(0, 30, 7):
+            is_target = lambda n: n == goal
+            expected = dijkstra(0, graph.__getitem__, is_target, path=False)
+            args = (0, goal, graph.__getitem__, reverse.__getitem__)
+            assert bidirectional(*args, path=False) == expected
+            path = bidirectional(*args)
+            if expected is None:
+                assert path is None
+            else:
+                assert path[0] == 0 and path[-1] == goal
+                assert path_cost(graph, path) == expected
+
+
+def test_bounds():
+    # A line 0 -> 1 -> ... -> 99 with unit costs.
+    adjacent = lambda n: [(1, n + 1)] if n < 99 else []
+    reverse = lambda n: [(1, n - 1)] if n > 0 else []
+    h = lambda n: 0
+    is_target = lambda n: n == 99
+
+    assert astar(0, adjacent, h, is_target, path=False, max_cost=99) == 99
+    assert astar(0, adjacent, h, is_target, max_cost=50) is BOUND_EXCEEDED
+    assert astar(0, adjacent, h, is_target, max_expansions=10) is BOUND_EXCEEDED
+    assert astar(0, adjacent, h, lambda n: n == 100, max_cost=200) is None
+    assert not BOUND_EXCEEDED
+
+    assert bidirectional(0, 99, adjacent, reverse, path=False, max_cost=99) == 99
+    assert bidirectional(0, 99, adjacent, reverse, max_cost=50) is BOUND_EXCEEDED
+    assert bidirectional(0, 99, adjacent, reverse, max_expansions=10) is BOUND_EXCEEDED
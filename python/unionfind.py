@@ -0,0 +1,143 @@
+# Disjoint sets, symlinked into the <year>/python directories that need them.
+
+
+# https://en.wikipedia.org/wiki/Disjoint-set_data_structure
+#
+# Union by rank with path compression. Elements can be any hashable value and
+# are added on first use; `count` is the number of disjoint sets.
+class DisjointSet:
+    def __init__(self, elements=()):
+        self.parent = {}
+        self.rank = {}
+        self.sizes = {}
+        self.count = 0
+        for x in elements:
+            self.add(x)
+
+    def add(self, x):
+        if x not in self.parent:
+            self.parent[x] = x
+            self.rank[x] = 0
+            self.sizes[x] = 1
+            self.count += 1
+
+    def __contains__(self, x):
+        return x in self.parent
+
+    def find(self, x):
+        parent = self.parent
+        if x not in parent:
+            self.add(x)
+            return x
+
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    # Merges the sets of `x` and `y`, returns False if they were one set already.
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+
+        if self.rank[x] < self.rank[y]:
+            x, y = y, x
+        elif self.rank[x] == self.rank[y]:
+            self.rank[x] += 1
+        self.parent[y] = x
+        self.sizes[x] += self.sizes.pop(y)
+        self.count -= 1
+        return True
+
+    def size(self, x):
+        return self.sizes[self.find(x)]
+
+
+def runs(row):
+    # Splits the set bits of `row` into maximal runs of adjacent bits, from the
+    # lowest bit up. Adding the lowest set bit carries through its run.
+    while row:
+        low = row & -row
+        run = row & ~(row + low)
+        yield run
+        row ^= run
+
+
+# Connected components (4-neighbourhood) of a grid of bits, given as one integer
+# per row. Every run of set bits in a row is one node; runs overlapping a run of
+# the previous row are merged. Returns the number of components and for every
+# row a list of (run, label) pairs, labels numbered from 0.
+def label_regions(rows):
+    sets = DisjointSet()
+    row_runs = []
+    prev = []
+    for y, row in enumerate(rows):
+        current = [(y, run) for run in runs(row)]
+        for node in current:
+            sets.add(node)
+
+        # Both lists are ordered by bit position: step past whichever run ends
+        # first.
+        i = j = 0
+        while i < len(current) and j < len(prev):
+            a, b = current[i][1], prev[j][1]
+            if a & b:
+                sets.union(current[i], prev[j])
+            if a.bit_length() < b.bit_length():
+                i += 1
+            else:
+                j += 1
+
+        row_runs.append(current)
+        prev = current
+
+    labels = {}
+    result = []
+    for current in row_runs:
+        labelled = []
+        for node in current:
+            label = labels.setdefault(sets.find(node), len(labels))
+            labelled.append((node[1], label))
+        result.append(labelled)
+    return sets.count, result
+
+
+def test_disjoint_set():
+    sets = DisjointSet(range(5))
+    assert sets.count == 5
+    assert sets.union(0, 1)
+    assert sets.union(3, 4)
+    assert not sets.union(1, 0)
+    assert sets.find(0) == sets.find(1)
+    assert sets.find(1) != sets.find(3)
+    assert sets.size(1) == 2 and sets.size(2) == 1
+    assert sets.count == 3
+    assert sets.union(1, 4)
+    assert sets.size(3) == 4 and sets.count == 2
+    assert 7 not in sets and sets.find(7) == 7 and 7 in sets
+
+
+def test_label_regions():
+    # Cells that only touch diagonally are separate regions. Bit x is column x.
+    # .#
+    # #.
+    count, rows = label_regions([0b10, 0b01])
+    assert count == 2
+    assert rows == [[(0b10, 0)], [(0b01, 1)]]
+
+    # A U shape: the two arms only merge in the last row.
+    # #.#
+    # #.#
+    # ###
+    count, rows = label_regions([0b101, 0b101, 0b111])
+    assert count == 1
+    assert rows == [[(0b001, 0), (0b100, 0)], [(0b001, 0), (0b100, 0)], [(0b111, 0)]]
+
+    # Runs that end right where the next row's run begins don't touch.
+    # ##..
+    # ..##
+    assert label_regions([0b0011, 0b1100])[0] == 2
+    assert label_regions([]) == (0, [])